@@ -0,0 +1,40 @@
+"""
+In-process background tasks for Aevum Health platform
+There is no task broker; work runs on a small thread pool once the request's
+transaction commits, or inline when BACKGROUND_TASKS_EAGER is set.
+"""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.BACKGROUND_TASK_WORKERS, thread_name_prefix='aevum-task')
+
+
+def _run(func, args, kwargs):
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", func.__name__)
+
+
+def _run_in_worker(func, args, kwargs):
+    try:
+        _run(func, args, kwargs)
+    finally:
+        # Pool threads outlive the task; don't leave their DB connections open
+        connections.close_all()
+
+
+def run_in_background(func, *args, **kwargs):
+    """Run func off the request thread once the current transaction commits (inline when eager)"""
+    def submit():
+        if settings.BACKGROUND_TASKS_EAGER:
+            _run(func, args, kwargs)
+        else:
+            _executor.submit(_run_in_worker, func, args, kwargs)
+    transaction.on_commit(submit)
@@ -0,0 +1,29 @@
+"""
+Reusable DRF view mixins for Aevum Health platform
+"""
+
+import json
+
+from django.http import StreamingHttpResponse
+from rest_framework.utils.encoders import JSONEncoder
+
+
+class JSONLinesExportMixin:
+    """
+    ?export=1 streams every matching row as JSON lines instead of one page.
+    Rows are read with iterator(), a server-side cursor on PostgreSQL, so memory
+    stays bounded by export_chunk_size however many rows match.
+    """
+    export_chunk_size = 500
+    
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get('export') != '1':
+            return super().list(request, *args, **kwargs)
+        
+        queryset = self.filter_queryset(self.get_queryset())
+        serializer = self.get_serializer()
+        rows = (
+            json.dumps(serializer.to_representation(obj), cls=JSONEncoder) + '\n'
+            for obj in queryset.iterator(chunk_size=self.export_chunk_size)
+        )
+        return StreamingHttpResponse(rows, content_type='application/x-ndjson')
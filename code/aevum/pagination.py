@@ -2,7 +2,7 @@
 Custom pagination classes for Aevum Health platform
 """
 
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.pagination import CursorPagination, PageNumberPagination
 from rest_framework.response import Response
 from django.conf import settings
 import environ
@@ -86,13 +86,46 @@ class SmallResultsPagination(PageNumberPagination):
         })
 
 
+class StandardCursorPagination(CursorPagination):
+    """
+    Keyset pagination for large, append-mostly tables
+    Each page is a WHERE on the ordering column instead of an OFFSET scan,
+    so deep pages cost the same as the first one
+    """
+    page_size = env.int('PAGE_SIZE', default=20)
+    page_size_query_param = 'page_size'
+    max_page_size = env.int('MAX_PAGE_SIZE', default=100)
+    ordering = ('-created_at', '-id')
+    
+    def get_ordering(self, request, queryset, view):
+        """Append the primary key so rows sharing an ordering value keep a fixed order"""
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        if not any(field.lstrip('-') in ('id', 'pk') for field in ordering):
+            ordering += ('-id' if ordering[0].startswith('-') else 'id',)
+        return ordering
+    
+    def get_paginated_response(self, data):
+        # No count/total_pages: they would cost a COUNT(*) per page, so views
+        # switching to cursor pages must be served under a new endpoint
+        return Response({
+            'pagination': {
+                'page_size': self.get_page_size(self.request),
+                'has_next': self.has_next,
+                'has_previous': self.has_previous,
+                'next': self.get_next_link(),
+                'previous': self.get_previous_link(),
+            },
+            'results': data
+        })
+
+
 # Convenience function to get pagination class based on type
 def get_pagination_class(pagination_type='standard'):
     """
     Get pagination class based on type
     
     Args:
-        pagination_type (str): 'standard', 'large', or 'small'
+        pagination_type (str): 'standard', 'large', 'small', or 'cursor'
     
     Returns:
         Pagination class
@@ -101,6 +134,7 @@ def get_pagination_class(pagination_type='standard'):
         'standard': StandardResultsPagination,
         'large': LargeResultsPagination,
         'small': SmallResultsPagination,
+        'cursor': StandardCursorPagination,
     }
     
     return pagination_classes.get(pagination_type, StandardResultsPagination) 
\ No newline at end of file
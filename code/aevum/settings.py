@@ -127,6 +127,53 @@ DATABASES = {
     }
 }
 
+if 'postgresql' in DATABASES['default']['ENGINE']:
+    # Keep connections open between requests instead of paying connect + TLS +
+    # auth on every one; health checks drop connections the server closed.
+    # Set DB_CONN_MAX_AGE=0 when pgbouncer does the pooling.
+    DATABASES['default']['CONN_MAX_AGE'] = env.int('DB_CONN_MAX_AGE', default=60)
+    DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+    # psycopg 3 prepares a statement on its first run so hot lookups (e.g. reset
+    # tokens) skip re-planning. Disable behind a transaction-mode pgbouncer.
+    if env.bool('DB_SERVER_SIDE_BINDING', default=True):
+        DATABASES['default']['OPTIONS'] = {
+            'server_side_binding': True,
+            'prepare_threshold': env.int('DB_PREPARE_THRESHOLD', default=1),
+        }
+
+
+# Cache
+# Redis when REDIS_URL is set, otherwise per-process memory
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+if env('REDIS_URL', default=''):
+    CACHES['default'] = {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': env('REDIS_URL'),
+    }
+
+# Per-user subscription payloads are dropped by signal handlers, which only reach
+# the worker's own cache; with per-process memory other workers would keep serving
+# a stale plan or status, so these payloads are only cached on a shared backend.
+CACHE_USER_SUBSCRIPTIONS = env.bool(
+    'CACHE_USER_SUBSCRIPTIONS',
+    default=CACHES['default']['BACKEND'] != 'django.core.cache.backends.locmem.LocMemCache',
+)
+
+
+# Password hashing
+# Argon2id first; the PBKDF2 entries only verify (and upgrade on login) older hashes
+
+PASSWORD_HASHERS = [
+    'authentication.hashers.OWASPArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+]
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -185,6 +232,11 @@ DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default=EMAIL_HOST_USER)
 CONTACT_EMAIL = env('CONTACT_EMAIL', default=EMAIL_HOST_USER)
 ADMIN_EMAIL = env('ADMIN_EMAIL', default=EMAIL_HOST_USER)
 
+# Background tasks (aevum/background.py) run on an in-process thread pool after the
+# request commits; eager mode runs them inline instead, e.g. in tests
+BACKGROUND_TASK_WORKERS = env.int('BACKGROUND_TASK_WORKERS', default=2)
+BACKGROUND_TASKS_EAGER = env.bool('BACKGROUND_TASKS_EAGER', default=False)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
@@ -243,6 +295,11 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
     'DEFAULT_PAGINATION_CLASS': 'aevum.pagination.StandardResultsPagination',
+    # Per-IP limits for endpoints that hash passwords or send email (see aevum.throttles)
+    'DEFAULT_THROTTLE_RATES': {
+        'forgot_password': env('FORGOT_PASSWORD_RATE', default='5/min'),
+        'change_password': env('CHANGE_PASSWORD_RATE', default='5/min'),
+    },
 }
 
 # JWT SETTINGS
@@ -0,0 +1,26 @@
+"""
+Custom request throttles for Aevum Health platform
+"""
+
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class IPScopedRateThrottle(SimpleRateThrottle):
+    """
+    Throttles every caller, authenticated or not, by client IP within `scope`.
+    Rates come from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'][scope].
+    """
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {
+            'scope': self.scope,
+            'ident': self.get_ident(request),
+        }
+
+
+class ForgotPasswordRateThrottle(IPScopedRateThrottle):
+    scope = 'forgot_password'
+
+
+class ChangePasswordRateThrottle(IPScopedRateThrottle):
+    scope = 'change_password'
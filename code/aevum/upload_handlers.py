@@ -0,0 +1,28 @@
+"""
+Custom file upload handlers for Aevum Health platform
+"""
+
+from django.core.files.uploadhandler import FileUploadHandler
+from rest_framework.exceptions import ValidationError
+
+
+class MaxUploadSizeHandler(FileUploadHandler):
+    """
+    Rejects a file as soon as its streamed size passes max_size, before the
+    rest of the body is buffered to memory or disk.
+    Install it first in request.upload_handlers; it passes chunks through to
+    the handlers after it and never produces a file itself.
+    """
+
+    def __init__(self, request=None, max_size=5 * 1024 * 1024, message=None):
+        super().__init__(request)
+        self.max_size = max_size
+        self.message = message or f"File too large. Maximum size is {max_size // (1024 * 1024)}MB."
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_size:
+            raise ValidationError({self.field_name: [self.message]})
+        return raw_data
+
+    def file_complete(self, file_size):
+        return None
@@ -1,6 +1,6 @@
 from django.contrib import admin
 from django.utils.html import format_html
-from .models import UserProfile, PasswordResetToken, SubscriptionPlan, UserSubscription, SubscriptionHistory
+from .models import UserProfile, UserMedicalHistory, PasswordResetToken, SubscriptionPlan, UserSubscription, SubscriptionHistory
 
 
 @admin.register(PasswordResetToken)
@@ -20,12 +20,22 @@ class PasswordResetTokenAdmin(admin.ModelAdmin):
 		return False  # Prevent manual creation through admin
 
 
+class UserMedicalHistoryInline(admin.StackedInline):
+	model = UserMedicalHistory
+	can_delete = False
+	verbose_name_plural = 'Medical History'
+	fields = (
+		'chronic_conditions', 'surgeries', 'allergies', 'medications_current', 'family_history', 'vaccinations',
+	)
+
+
 @admin.register(UserProfile)
 class UserProfileAdmin(admin.ModelAdmin):
 	list_display = ('user', 'date_of_birth', 'blood_group', 'phone_number', 'created_at')
 	search_fields = ('user__username', 'user__email', 'phone_number', 'blood_group')
 	list_filter = ('blood_group', 'data_sharing_consent', 'research_consent')
 	readonly_fields = ('created_at', 'updated_at')
+	inlines = [UserMedicalHistoryInline]
 
 	fieldsets = (
 		('User Link', {
@@ -51,11 +61,6 @@ class UserProfileAdmin(admin.ModelAdmin):
 				'smoking_status', 'alcohol_use', 'physical_activity_level', 'diet_type', 'sleep_hours', 'stress_level',
 			)
 		}),
-		('Medical History', {
-			'fields': (
-				'chronic_conditions', 'surgeries', 'allergies', 'medications_current', 'family_history', 'vaccinations',
-			)
-		}),
 		('Reproductive Health', {
 			'fields': ('reproductive_health_notes',),
 		}),
@@ -120,7 +125,7 @@ class SubscriptionPlanAdmin(admin.ModelAdmin):
 	price_display.short_description = 'Price'
 	
 	def subscribers_count(self, obj):
-		count = obj.subscriptions.filter(status='ACTIVE').count()
+		count = obj.subscriptions.filter(status=UserSubscription.Status.ACTIVE).count()
 		return format_html(f'<strong>{count}</strong>')
 	subscribers_count.short_description = 'Active Subscribers'
 
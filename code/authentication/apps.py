@@ -6,4 +6,8 @@ class AuthenticationConfig(AppConfig):
 	name = 'authentication'
 
 	def ready(self):
+		from django.contrib.auth.password_validation import get_default_password_validators
 		from . import signals  # noqa: F401
+		
+		# Build the (cached) validators now so the first password change doesn't load the common-password list
+		get_default_password_validators()
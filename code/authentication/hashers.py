@@ -0,0 +1,13 @@
+from django.contrib.auth.hashers import Argon2PasswordHasher
+
+
+class OWASPArgon2PasswordHasher(Argon2PasswordHasher):
+	"""
+	Argon2id with the OWASP minimum profile (46 MiB, 2 passes, 1 lane)
+
+	Keeps Django's 'argon2' algorithm name, so hashes made with other Argon2
+	parameters still verify and are re-hashed with these on the next login.
+	"""
+	time_cost = 2
+	memory_cost = 46 * 1024  # KiB
+	parallelism = 1
@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from datetime import timedelta
+from authentication.models import UserSubscription
+
+
+class Command(BaseCommand):
+    help = 'Reset monthly usage counters for subscriptions whose usage period has elapsed (run hourly from cron)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=30,
+            help='Reset counters last reset more than this many days ago (default: 30)'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show how many subscriptions would be reset without updating them'
+        )
+
+    def handle(self, *args, **options):
+        days = options['days']
+        period = timedelta(days=days)
+
+        if options['dry_run']:
+            count = UserSubscription.objects.filter(
+                last_usage_reset__lt=timezone.now() - period
+            ).count()
+            self.stdout.write(
+                self.style.WARNING(
+                    f'DRY RUN: Would reset monthly usage for {count} subscriptions older than {days} days'
+                )
+            )
+            return
+
+        count = UserSubscription.objects.reset_monthly_usage_bulk(period)
+        self.stdout.write(
+            self.style.SUCCESS(f'Reset monthly usage for {count} subscriptions')
+        )
@@ -0,0 +1,91 @@
+# Generated by Django 5.2.6 on 2026-10-16 17:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+MEDICAL_HISTORY_FIELDS = [
+    'chronic_conditions',
+    'surgeries',
+    'allergies',
+    'medications_current',
+    'family_history',
+    'vaccinations',
+]
+
+
+def copy_medical_history(apps, schema_editor):
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    UserMedicalHistory = apps.get_model('authentication', 'UserMedicalHistory')
+
+    histories = []
+    for row in UserProfile.objects.values('id', *MEDICAL_HISTORY_FIELDS).iterator():
+        profile_id = row.pop('id')
+        # Only profiles that actually hold medical data need a row
+        if any(row.values()):
+            histories.append(UserMedicalHistory(profile_id=profile_id, **row))
+
+    UserMedicalHistory.objects.bulk_create(histories, batch_size=500)
+
+
+def restore_medical_history(apps, schema_editor):
+    UserProfile = apps.get_model('authentication', 'UserProfile')
+    UserMedicalHistory = apps.get_model('authentication', 'UserMedicalHistory')
+
+    for row in UserMedicalHistory.objects.values('profile_id', *MEDICAL_HISTORY_FIELDS).iterator():
+        profile_id = row.pop('profile_id')
+        UserProfile.objects.filter(id=profile_id).update(**row)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0006_alter_userprofile_allergies_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserMedicalHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('chronic_conditions', models.TextField(blank=True, null=True)),
+                ('surgeries', models.TextField(blank=True, null=True)),
+                ('allergies', models.TextField(blank=True, null=True)),
+                ('medications_current', models.TextField(blank=True, null=True)),
+                ('family_history', models.TextField(blank=True, null=True)),
+                ('vaccinations', models.TextField(blank=True, null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='medical', to='authentication.userprofile')),
+            ],
+            options={
+                'verbose_name': 'User Medical History',
+                'verbose_name_plural': 'User Medical Histories',
+            },
+        ),
+        migrations.RunPython(copy_medical_history, restore_medical_history),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='allergies',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='chronic_conditions',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='family_history',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='medications_current',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='surgeries',
+        ),
+        migrations.RemoveField(
+            model_name='userprofile',
+            name='vaccinations',
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-16 17:45
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0007_usermedicalhistory'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='subscriptionplan',
+            name='monthly_price',
+            field=models.GeneratedField(db_index=True, db_persist=True, expression=models.Case(models.When(billing_cycle='MONTHLY', then=models.F('price')), models.When(billing_cycle='QUARTERLY', then=models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('price'), '/', models.Value(3.0)), output_field=models.DecimalField())), models.When(billing_cycle='YEARLY', then=models.ExpressionWrapper(django.db.models.expressions.CombinedExpression(models.F('price'), '/', models.Value(12.0)), output_field=models.DecimalField())), default=models.Value(0), output_field=models.DecimalField(decimal_places=2, max_digits=10)), output_field=models.DecimalField(decimal_places=2, max_digits=10)),
+        ),
+    ]
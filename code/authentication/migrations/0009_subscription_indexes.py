@@ -0,0 +1,31 @@
+# Generated by Django 5.2.6 on 2026-10-16 17:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0008_subscriptionplan_monthly_price'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='subscriptionhistory',
+            index=models.Index(fields=['user', '-created_at'], name='subhist_user_created'),
+        ),
+        migrations.AddIndex(
+            model_name='subscriptionhistory',
+            index=models.Index(fields=['subscription', '-created_at'], name='subhist_sub_created'),
+        ),
+        migrations.AddIndex(
+            model_name='usersubscription',
+            index=models.Index(fields=['status', 'end_date'], name='usersub_status_end'),
+        ),
+        migrations.AddIndex(
+            model_name='usersubscription',
+            index=models.Index(condition=models.Q(('auto_renew', True)), fields=['next_billing_date'], name='usersub_next_billing'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations
+
+
+def create_metadata_gin_index(apps, schema_editor):
+    # GIN/jsonb indexes only exist on PostgreSQL; SQLite dev databases skip this
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS subhist_metadata_gin '
+        'ON authentication_subscriptionhistory USING gin (metadata jsonb_path_ops)'
+    )
+
+
+def drop_metadata_gin_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS subhist_metadata_gin')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0009_subscription_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_metadata_gin_index, drop_metadata_gin_index),
+    ]
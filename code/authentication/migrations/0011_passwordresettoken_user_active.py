@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-16 17:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0010_subscriptionhistory_metadata_gin'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='passwordresettoken',
+            index=models.Index(condition=models.Q(('is_used', False)), fields=['user'], name='resettoken_user_active'),
+        ),
+    ]
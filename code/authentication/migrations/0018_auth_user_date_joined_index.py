@@ -0,0 +1,20 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """
+    The admin user list orders by -date_joined and filters on date_joined
+    ranges; auth_user has no index on the column upstream.
+    """
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('authentication', '0017_user_name_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            'CREATE INDEX IF NOT EXISTS auth_user_date_joined_idx ON auth_user (date_joined)',
+            'DROP INDEX IF EXISTS auth_user_date_joined_idx',
+        ),
+    ]
@@ -1,27 +1,70 @@
 import os
+import base64
 import secrets
+import time
 from datetime import timedelta
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Case, ExpressionWrapper, F, FloatField, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest, Least
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.utils import timezone
+from django.utils.functional import cached_property
+
+
+# Columns needed to serve and update the profile image
+PROFILE_IMAGE_FIELDS = (
+	'user', 'profile_image', 'date_of_birth', 'phone_number', 'blood_group', 'updated_at',
+)
+
+# Medical history columns stored on UserMedicalHistory
+MEDICAL_HISTORY_FIELDS = (
+	'chronic_conditions', 'surgeries', 'allergies', 'medications_current', 'family_history', 'vaccinations',
+)
+
+
+# Maximum profile image size (5MB)
+PROFILE_IMAGE_MAX_SIZE = 5 * 1024 * 1024
 
 
 def validate_image_size(image):
 	"""Validate that the image is not too large (max 5MB)"""
-	max_size = 5 * 1024 * 1024  # 5MB
-	if image.size > max_size:
+	if image.size > PROFILE_IMAGE_MAX_SIZE:
 		raise ValidationError("Image file too large. Maximum size is 5MB.")
 
 
 def user_profile_image_path(instance, filename):
 	"""Generate upload path for user profile images"""
 	# Get file extension
-	ext = filename.split('.')[-1].lower()
-	# Create filename: user_id_profile.extension
-	filename = f"user_{instance.user.id}_profile.{ext}"
+	ext = filename.rpartition('.')[2].lower()
 	# Return path: media/profile_images/user_id_profile.extension
-	return os.path.join('profile_images', filename)
+	# (user_id avoids loading the User row; storage paths use forward slashes)
+	return f"profile_images/user_{instance.user_id}_profile.{ext}"
+
+
+# Random bytes per reset token; matches secrets.token_urlsafe(32)
+RESET_TOKEN_BYTES = 32
+RESET_TOKEN_LIFETIME = timedelta(hours=1)
+
+
+class PasswordResetTokenManager(models.Manager):
+	def valid(self):
+		"""Unused tokens that have not expired; keeps the token lookup a single SQL shape"""
+		return self.filter(is_used=False, created_at__gt=timezone.now() - RESET_TOKEN_LIFETIME)
+	
+	def bulk_create_tokens(self, users, batch_size=500):
+		"""Create one reset token per user, reading all randomness in a single urandom call"""
+		users = list(users)
+		entropy = os.urandom(RESET_TOKEN_BYTES * len(users))
+		tokens = []
+		for index, user in enumerate(users):
+			chunk = entropy[index * RESET_TOKEN_BYTES:(index + 1) * RESET_TOKEN_BYTES]
+			tokens.append(self.model(
+				user=user,
+				token=base64.urlsafe_b64encode(chunk).rstrip(b'=').decode('ascii'),
+			))
+		return self.bulk_create(tokens, batch_size=batch_size)
 
 
 class PasswordResetToken(models.Model):
@@ -31,12 +74,22 @@ class PasswordResetToken(models.Model):
 	used_at = models.DateTimeField(null=True, blank=True)
 	is_used = models.BooleanField(default=False)
 	
+	objects = PasswordResetTokenManager()
+	
 	class Meta:
 		ordering = ['-created_at']
+		indexes = [
+			models.Index(fields=['user'], condition=Q(is_used=False), name='resettoken_user_active'),
+		]
+	
+	@classmethod
+	def invalidate_for_user(cls, user):
+		"""Mark all of a user's unused tokens as used in a single UPDATE"""
+		return cls.objects.filter(user=user, is_used=False).update(is_used=True, used_at=timezone.now())
 	
 	def save(self, *args, **kwargs):
 		if not self.token:
-			self.token = secrets.token_urlsafe(32)
+			self.token = secrets.token_urlsafe(RESET_TOKEN_BYTES)
 		super().save(*args, **kwargs)
 	
 	def is_valid(self):
@@ -45,7 +98,7 @@ class PasswordResetToken(models.Model):
 			return False
 		
 		# Token expires after 1 hour
-		expiry_time = self.created_at + timedelta(hours=1)
+		expiry_time = self.created_at + RESET_TOKEN_LIFETIME
 		return timezone.now() < expiry_time
 	
 	def mark_as_used(self):
@@ -100,14 +153,6 @@ class UserProfile(models.Model):
 	sleep_hours = models.FloatField(null=True, blank=True)
 	stress_level = models.CharField(max_length=100, null=True, blank=True)
 
-	# Medical history
-	chronic_conditions = models.TextField(null=True, blank=True)
-	surgeries = models.TextField(null=True, blank=True)
-	allergies = models.TextField(null=True, blank=True)
-	medications_current = models.TextField(null=True, blank=True)
-	family_history = models.TextField(null=True, blank=True)
-	vaccinations = models.TextField(null=True, blank=True)
-
 	# Reproductive health
 	reproductive_health_notes = models.TextField(null=True, blank=True)
 
@@ -132,7 +177,7 @@ class UserProfile(models.Model):
 	research_consent = models.BooleanField(default=False)
 
 	# Cross-domain IDs
-	dna_profile_id = models.CharField(max_length=255, null=True, blank=True)
+	dna_profile_id = models.CharField(max_length=255, null=True, blank=True, db_index=True)
 
 	# Timestamps
 	created_at = models.DateTimeField(auto_now_add=True)
@@ -142,29 +187,71 @@ class UserProfile(models.Model):
 		return f"UserProfile(user_id={self.user_id})"
 
 
+class UserMedicalHistory(models.Model):
+	"""
+	Medical history for a user profile, kept in its own table so the
+	large TextFields stay out of the frequently read UserProfile row
+	"""
+	profile = models.OneToOneField(UserProfile, on_delete=models.CASCADE, related_name='medical')
+
+	chronic_conditions = models.TextField(null=True, blank=True)
+	surgeries = models.TextField(null=True, blank=True)
+	allergies = models.TextField(null=True, blank=True)
+	medications_current = models.TextField(null=True, blank=True)
+	family_history = models.TextField(null=True, blank=True)
+	vaccinations = models.TextField(null=True, blank=True)
+
+	# Timestamps
+	created_at = models.DateTimeField(auto_now_add=True)
+	updated_at = models.DateTimeField(auto_now=True)
+
+	class Meta:
+		verbose_name = 'User Medical History'
+		verbose_name_plural = 'User Medical Histories'
+
+	def __str__(self) -> str:
+		return f"UserMedicalHistory(profile_id={self.profile_id})"
+
+
 class SubscriptionPlan(models.Model):
 	"""
 	Subscription plans available for users
 	"""
-	PLAN_TYPES = [
-		('FREE', 'Free'),
-		('BASIC', 'Basic'),
-		('PREMIUM', 'Premium'),
-		('ENTERPRISE', 'Enterprise'),
-	]
+	class PlanType(models.TextChoices):
+		FREE = 'FREE', 'Free'
+		BASIC = 'BASIC', 'Basic'
+		PREMIUM = 'PREMIUM', 'Premium'
+		ENTERPRISE = 'ENTERPRISE', 'Enterprise'
 	
-	BILLING_CYCLES = [
-		('MONTHLY', 'Monthly'),
-		('QUARTERLY', 'Quarterly'),
-		('YEARLY', 'Yearly'),
-		('LIFETIME', 'Lifetime'),
-	]
+	class BillingCycle(models.TextChoices):
+		MONTHLY = 'MONTHLY', 'Monthly'
+		QUARTERLY = 'QUARTERLY', 'Quarterly'
+		YEARLY = 'YEARLY', 'Yearly'
+		LIFETIME = 'LIFETIME', 'Lifetime'
+	
+	PLAN_TYPES = PlanType.choices
+	BILLING_CYCLES = BillingCycle.choices
 	
 	name = models.CharField(max_length=100, unique=True)
-	plan_type = models.CharField(max_length=20, choices=PLAN_TYPES, default='FREE')
+	plan_type = models.CharField(max_length=20, choices=PlanType.choices, default=PlanType.FREE)
 	description = models.TextField(blank=True, null=True)
 	price = models.DecimalField(max_digits=10, decimal_places=2, default=0.00)
-	billing_cycle = models.CharField(max_length=20, choices=BILLING_CYCLES, default='MONTHLY')
+	billing_cycle = models.CharField(max_length=20, choices=BillingCycle.choices, default=BillingCycle.MONTHLY)
+	
+	# Price converted to its monthly equivalent for comparison, computed by the database.
+	# Divisors are non-integer literals so SQLite doesn't truncate whole-number prices.
+	monthly_price = models.GeneratedField(
+		expression=Case(
+			When(billing_cycle=BillingCycle.MONTHLY, then=F('price')),
+			When(billing_cycle=BillingCycle.QUARTERLY, then=ExpressionWrapper(F('price') / Value(3.0), output_field=models.DecimalField())),
+			When(billing_cycle=BillingCycle.YEARLY, then=ExpressionWrapper(F('price') / Value(12.0), output_field=models.DecimalField())),
+			default=Value(0),
+			output_field=models.DecimalField(max_digits=10, decimal_places=2),
+		),
+		output_field=models.DecimalField(max_digits=10, decimal_places=2),
+		db_persist=True,
+		db_index=True,
+	)
 	
 	# Features and limits
 	dna_kits_included = models.PositiveIntegerField(default=0, help_text="Number of DNA kits included")
@@ -191,35 +278,177 @@ class SubscriptionPlan(models.Model):
 	def __str__(self):
 		return f"{self.name} ({self.get_plan_type_display()}) - ₹{self.price}/{self.get_billing_cycle_display().lower()}"
 	
+	def save(self, *args, **kwargs):
+		adding = self._state.adding
+		super().save(*args, **kwargs)
+		if not adding:
+			# UPDATE doesn't return generated columns; reload monthly_price lazily on next access
+			self.__dict__.pop('monthly_price', None)
+		self.__dict__.pop('features', None)
+	
 	@property
 	def is_free(self):
 		"""Check if this is a free plan"""
-		return self.plan_type == 'FREE' or self.price == 0
+		return self.plan_type == self.PlanType.FREE or self.price == 0
 	
-	@property
-	def monthly_price(self):
-		"""Convert price to monthly equivalent for comparison"""
-		if self.billing_cycle == 'MONTHLY':
-			return self.price
-		elif self.billing_cycle == 'QUARTERLY':
-			return self.price / 3
-		elif self.billing_cycle == 'YEARLY':
-			return self.price / 12
-		else:  # LIFETIME
-			return 0
+	@cached_property
+	def features(self):
+		"""Human-readable feature list, built once per instance"""
+		features = []
+		
+		if self.dna_kits_included > 0:
+			features.append(f"{self.dna_kits_included} DNA kits included")
+		elif self.dna_kits_included == 0 and self.plan_type != self.PlanType.FREE:
+			features.append("Unlimited DNA kits")
+		
+		if self.mood_entries_limit > 0:
+			features.append(f"{self.mood_entries_limit} mood entries per month")
+		elif self.mood_entries_limit == 0 and self.plan_type != self.PlanType.FREE:
+			features.append("Unlimited mood entries")
+		
+		if self.ai_insights_enabled:
+			features.append("AI-powered insights")
+		
+		if self.priority_support:
+			features.append("Priority customer support")
+		
+		if self.data_export_enabled:
+			features.append("Data export capabilities")
+		
+		if self.api_access_enabled:
+			features.append("API access")
+		
+		return features
+
+
+# Serialized plans are cached per (id, updated_at), so every save() moves to a new key
+SUBSCRIPTION_PLAN_CACHE_TIMEOUT = 60 * 60 * 24
+
+
+def subscription_plan_cache_key(plan):
+	return f"plan:{plan.pk}:{plan.updated_at.timestamp()}"
+
+
+# Public plan list responses are cached under a version that any plan change replaces
+SUBSCRIPTION_PLAN_LIST_CACHE_TIMEOUT = 60 * 5
+_PLANS_VERSION_KEY = 'subplans:version'
+
+
+def subscription_plans_version():
+	return cache.get_or_set(_PLANS_VERSION_KEY, time.time_ns, None)
+
+
+def bump_subscription_plans_version():
+	# A fresh timestamp can't collide with an older version, even if the key had been evicted
+	cache.set(_PLANS_VERSION_KEY, time.time_ns(), None)
+
+
+def subscription_plan_list_cache_key(query_string):
+	return f"subplans:{subscription_plans_version()}:{query_string}"
+
+
+# Per-user subscription payloads embed the plan, so they are keyed by the plans version too.
+# Saves/deletes of the subscription drop them; bulk updates rely on the timeouts.
+USER_SUBSCRIPTION_CACHE_TIMEOUT = 60 * 5
+SUBSCRIPTION_USAGE_CACHE_TIMEOUT = 60
+
+
+def user_subscription_cache_keys(user_id):
+	"""(subscription payload key, usage payload key) for the user"""
+	prefix = f"usersub:{subscription_plans_version()}:{user_id}"
+	return prefix, f"{prefix}:usage"
+
+
+# Defaults used when the FREE plan has to be created on demand
+FREE_PLAN_DEFAULTS = {
+	'name': 'Free Plan',
+	'description': 'Basic features at no cost',
+	'price': 0.00,
+	'billing_cycle': SubscriptionPlan.BillingCycle.MONTHLY,
+	'dna_kits_included': 1,
+	'mood_entries_limit': 30,
+	'ai_insights_enabled': False,
+	'priority_support': False,
+	'data_export_enabled': False,
+	'api_access_enabled': False,
+}
+
+_free_plan_id = None
+
+
+def _set_free_plan_id(plan_id):
+	global _free_plan_id
+	_free_plan_id = plan_id
+
+
+def get_free_plan_id():
+	"""Return the FREE plan id, creating the plan if it doesn't exist yet"""
+	if _free_plan_id is not None:
+		return _free_plan_id
+	plan_id = SubscriptionPlan.objects.filter(plan_type=SubscriptionPlan.PlanType.FREE).values_list('id', flat=True).first()
+	if plan_id is None:
+		plan_id = SubscriptionPlan.objects.create(plan_type=SubscriptionPlan.PlanType.FREE, **FREE_PLAN_DEFAULTS).id
+	# Only cache once committed, so a rolled-back plan row is never remembered
+	transaction.on_commit(lambda: _set_free_plan_id(plan_id))
+	return plan_id
+
+
+def clear_free_plan_cache():
+	_set_free_plan_id(None)
+
+
+def _usage_percent(used_field, limit_field):
+	"""SQL equivalent of min(100, used / limit * 100), NULL when the limit is unlimited (0)"""
+	return Case(
+		When(**{f'{limit_field}__gt': 0}, then=Least(
+			Value(100.0),
+			ExpressionWrapper(F(used_field) * 100.0 / F(limit_field), output_field=FloatField()),
+		)),
+		default=None,
+		output_field=FloatField(),
+	)
+
+
+def _remaining(used_field, limit_field):
+	"""SQL equivalent of max(0, limit - used), -1 when the limit is unlimited (0)"""
+	return Case(
+		When(**{f'{limit_field}__gt': 0}, then=Greatest(F(limit_field) - F(used_field), Value(0))),
+		default=Value(-1),
+		output_field=IntegerField(),
+	)
+
+
+class UserSubscriptionQuerySet(models.QuerySet):
+	def with_usage(self):
+		"""Annotate usage percentages and remaining allowances so they aren't computed per row"""
+		return self.annotate(
+			dna_kits_pct=_usage_percent('dna_kits_used', 'plan__dna_kits_included'),
+			mood_entries_pct=_usage_percent('mood_entries_this_month', 'plan__mood_entries_limit'),
+			dna_kits_remaining=_remaining('dna_kits_used', 'plan__dna_kits_included'),
+			mood_entries_remaining=_remaining('mood_entries_this_month', 'plan__mood_entries_limit'),
+		)
+	
+	def reset_monthly_usage_bulk(self, period=timedelta(days=30)):
+		"""Reset monthly usage counters that are older than period in a single UPDATE"""
+		now = timezone.now()
+		return self.filter(last_usage_reset__lt=now - period).update(
+			mood_entries_this_month=0,
+			last_usage_reset=now
+		)
 
 
 class UserSubscription(models.Model):
 	"""
 	User's subscription information
 	"""
-	STATUS_CHOICES = [
-		('ACTIVE', 'Active'),
-		('EXPIRED', 'Expired'),
-		('CANCELLED', 'Cancelled'),
-		('SUSPENDED', 'Suspended'),
-		('PENDING', 'Pending'),
-	]
+	class Status(models.TextChoices):
+		ACTIVE = 'ACTIVE', 'Active'
+		EXPIRED = 'EXPIRED', 'Expired'
+		CANCELLED = 'CANCELLED', 'Cancelled'
+		SUSPENDED = 'SUSPENDED', 'Suspended'
+		PENDING = 'PENDING', 'Pending'
+	
+	STATUS_CHOICES = Status.choices
 	
 	PAYMENT_METHODS = [
 		('CREDIT_CARD', 'Credit Card'),
@@ -233,7 +462,7 @@ class UserSubscription(models.Model):
 	plan = models.ForeignKey(SubscriptionPlan, on_delete=models.PROTECT, related_name='subscriptions')
 	
 	# Subscription details
-	status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+	status = models.CharField(max_length=20, choices=Status.choices, default=Status.PENDING)
 	start_date = models.DateTimeField(default=timezone.now)
 	end_date = models.DateTimeField(null=True, blank=True)
 	next_billing_date = models.DateTimeField(null=True, blank=True)
@@ -254,24 +483,33 @@ class UserSubscription(models.Model):
 	cancellation_reason = models.TextField(blank=True, null=True)
 	
 	# External payment system references
-	stripe_subscription_id = models.CharField(max_length=100, blank=True, null=True)
-	paypal_subscription_id = models.CharField(max_length=100, blank=True, null=True)
+	stripe_subscription_id = models.CharField(max_length=100, blank=True, null=True, db_index=True)
+	paypal_subscription_id = models.CharField(max_length=100, blank=True, null=True, db_index=True)
 	
 	# Timestamps
 	created_at = models.DateTimeField(auto_now_add=True)
 	updated_at = models.DateTimeField(auto_now=True)
 	
+	objects = UserSubscriptionQuerySet.as_manager()
+	
 	class Meta:
 		verbose_name = 'User Subscription'
 		verbose_name_plural = 'User Subscriptions'
+		indexes = [
+			models.Index(fields=['status', 'end_date'], name='usersub_status_end'),
+			models.Index(fields=['next_billing_date'], condition=Q(auto_renew=True), name='usersub_next_billing'),
+			# Keyset pagination of the admin list walks created_at, optionally within one status
+			models.Index(fields=['-created_at'], name='usersub_created'),
+			models.Index(fields=['status', '-created_at'], name='usersub_status_created'),
+		]
 	
 	def __str__(self):
-		return f"{self.user.username} - {self.plan.name} ({self.get_status_display()})"
+		return f"UserSubscription(user_id={self.user_id}, plan_id={self.plan_id}, status={self.status})"
 	
 	@property
 	def is_active(self):
 		"""Check if subscription is currently active"""
-		if self.status != 'ACTIVE':
+		if self.status != self.Status.ACTIVE:
 			return False
 		if self.end_date and timezone.now() > self.end_date:
 			return False
@@ -290,6 +528,14 @@ class UserSubscription(models.Model):
 		"""Calculate usage percentage for limited features"""
 		usage_stats = {}
 		
+		if hasattr(self, 'dna_kits_pct'):
+			# Already computed by UserSubscriptionQuerySet.with_usage()
+			if self.dna_kits_pct is not None:
+				usage_stats['dna_kits'] = self.dna_kits_pct
+			if self.mood_entries_pct is not None:
+				usage_stats['mood_entries'] = self.mood_entries_pct
+			return usage_stats
+		
 		if self.plan.dna_kits_included > 0:
 			usage_stats['dna_kits'] = min(100, (self.dna_kits_used / self.plan.dna_kits_included) * 100)
 		
@@ -298,37 +544,32 @@ class UserSubscription(models.Model):
 		
 		return usage_stats
 	
-	def can_use_feature(self, feature):
-		"""Check if user can use a specific feature"""
-		if not self.is_active:
-			return False
-			
-		feature_checks = {
-			'dna_kits': self.plan.dna_kits_included == 0 or self.dna_kits_used < self.plan.dna_kits_included,
-			'mood_entries': self.plan.mood_entries_limit == 0 or self.mood_entries_this_month < self.plan.mood_entries_limit,
-			'ai_insights': self.plan.ai_insights_enabled,
-			'priority_support': self.plan.priority_support,
-			'data_export': self.plan.data_export_enabled,
-			'api_access': self.plan.api_access_enabled,
+	def feature_availability_map(self):
+		"""Whether each feature can be used, checked in one pass over the plan"""
+		active = self.is_active
+		plan = self.plan
+		return {
+			'dna_kits': active and (plan.dna_kits_included == 0 or self.dna_kits_used < plan.dna_kits_included),
+			'mood_entries': active and (plan.mood_entries_limit == 0 or self.mood_entries_this_month < plan.mood_entries_limit),
+			'ai_insights': active and plan.ai_insights_enabled,
+			'priority_support': active and plan.priority_support,
+			'data_export': active and plan.data_export_enabled,
+			'api_access': active and plan.api_access_enabled,
 		}
-		
-		return feature_checks.get(feature, False)
 	
-	def reset_monthly_usage(self):
-		"""Reset monthly usage counters"""
-		self.mood_entries_this_month = 0
-		self.last_usage_reset = timezone.now()
-		self.save()
+	def can_use_feature(self, feature):
+		"""Check if user can use a specific feature"""
+		return self.feature_availability_map().get(feature, False)
 	
 	def upgrade_plan(self, new_plan):
 		"""Upgrade to a new subscription plan"""
 		self.plan = new_plan
-		self.status = 'ACTIVE'
+		self.status = self.Status.ACTIVE
 		self.save()
 	
 	def cancel_subscription(self, reason=None):
 		"""Cancel the subscription"""
-		self.status = 'CANCELLED'
+		self.status = self.Status.CANCELLED
 		self.cancelled_at = timezone.now()
 		self.auto_renew = False
 		if reason:
@@ -363,6 +604,7 @@ class SubscriptionHistory(models.Model):
 	
 	# Additional information
 	notes = models.TextField(blank=True, null=True)
+	# GIN indexed (jsonb_path_ops) on PostgreSQL; filter with metadata__contains={...}
 	metadata = models.JSONField(default=dict, blank=True)
 	
 	# Timestamp
@@ -372,6 +614,10 @@ class SubscriptionHistory(models.Model):
 		ordering = ['-created_at']
 		verbose_name = 'Subscription History'
 		verbose_name_plural = 'Subscription Histories'
+		indexes = [
+			models.Index(fields=['user', '-created_at'], name='subhist_user_created'),
+			models.Index(fields=['subscription', '-created_at'], name='subhist_sub_created'),
+		]
 	
 	def __str__(self):
-		return f"{self.user.username} - {self.get_action_type_display()} ({self.created_at.strftime('%Y-%m-%d')})"
+		return f"SubscriptionHistory(user_id={self.user_id}, action={self.action_type}, created_at={self.created_at.date().isoformat()})"
@@ -1,9 +1,88 @@
+import operator
+from functools import cache as memoize, reduce
+
 from rest_framework import serializers
 from django.contrib.auth.models import User
-from django.contrib.auth.password_validation import validate_password
+from django.contrib.auth.password_validation import (
+	CommonPasswordValidator,
+	UserAttributeSimilarityValidator,
+	get_default_password_validators,
+	validate_password,
+)
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Case, Q, Value, When, prefetch_related_objects
 from django.utils import timezone
-from .models import UserProfile, PasswordResetToken, SubscriptionPlan, UserSubscription, SubscriptionHistory
+from django.utils.dateparse import parse_datetime
+from .models import UserProfile, UserMedicalHistory, PasswordResetToken, SubscriptionPlan, UserSubscription, SubscriptionHistory, PROFILE_IMAGE_MAX_SIZE, SUBSCRIPTION_PLAN_CACHE_TIMEOUT, subscription_plan_cache_key
+
+
+# Validators that need per-call work beyond inspecting the string itself
+_SLOW_PASSWORD_VALIDATORS = (CommonPasswordValidator, UserAttributeSimilarityValidator)
+
+
+def _validate_password(value):
+	"""Run the configured password validators, skipping the slow ones if a cheap one already fails"""
+	validators = get_default_password_validators()
+	try:
+		validate_password(value, password_validators=[v for v in validators if not isinstance(v, _SLOW_PASSWORD_VALIDATORS)])
+		validate_password(value, password_validators=[v for v in validators if isinstance(v, _SLOW_PASSWORD_VALIDATORS)])
+	except ValidationError as e:
+		raise serializers.ValidationError(e.messages)
+	return value
+
+
+# Profile image extensions, listed in the order shown in error messages
+_IMAGE_FORMATS = ('jpeg', 'jpg', 'png', 'gif')
+
+# First four bytes of each allowed format; JPEG only fixes three, so it's stored masked
+_JPEG_SIGNATURE_MASK = 0xFFFFFF00
+_IMAGE_SIGNATURES = {
+	0x89504E47: 'png',   # \x89PNG
+	0xFFD8FF00: 'jpeg',  # SOI marker + any segment
+	0x47494638: 'gif',   # GIF8
+}
+
+
+def _validate_profile_image(value):
+	"""Shared size and format check for profile image uploads"""
+	if value:
+		# Check file size (max 5MB)
+		if value.size > PROFILE_IMAGE_MAX_SIZE:
+			raise serializers.ValidationError("Image file too large. Maximum size is 5MB.")
+		
+		# Check file format from the content, not the client-supplied name
+		value.seek(0)
+		signature = int.from_bytes(value.read(4), 'big')
+		value.seek(0)
+		if signature not in _IMAGE_SIGNATURES and (signature & _JPEG_SIGNATURE_MASK) not in _IMAGE_SIGNATURES:
+			raise serializers.ValidationError(
+				f"Invalid file format. Allowed formats: {', '.join(_IMAGE_FORMATS)}"
+			)
+	
+	return value
+
+
+class _AbsoluteFileURLField(serializers.ReadOnlyField):
+	"""
+	Absolute URL of a stored file, or None when empty or missing.
+	The scheme://host prefix is worked out once per serialization and shared through the context.
+	"""
+	def __init__(self, **kwargs):
+		kwargs.setdefault('allow_null', True)
+		super().__init__(**kwargs)
+	
+	def to_representation(self, value):
+		if not value:
+			return None
+		url = value.url
+		request = self.context.get('request')
+		if request is None or not url.startswith('/'):
+			return url
+		if '_absolute_url_prefix' not in self.context:
+			self.context['_absolute_url_prefix'] = request.build_absolute_uri('/')[:-1]
+		return self.context['_absolute_url_prefix'] + url
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -16,32 +95,29 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 		fields = ('username', 'email', 'first_name', 'last_name', 'password', 'password_confirm', 'phone_number')
 		extra_kwargs = {
 			'email': {'required': True},
+			# Uniqueness is checked in validate() together with the email
+			'username': {'validators': [User.username_validator]},
 			'first_name': {'required': True},
 			'last_name': {'required': True},
 		}
 	
-	def validate_email(self, value):
-		"""Check if email is already registered"""
-		if User.objects.filter(email=value).exists():
-			raise serializers.ValidationError("A user with this email already exists.")
-		return value
-	
-	def validate_username(self, value):
-		"""Check if username is already taken"""
-		if User.objects.filter(username=value).exists():
-			raise serializers.ValidationError("A user with this username already exists.")
-		return value
-	
 	def validate_password(self, value):
 		"""Validate password using Django's password validators"""
-		try:
-			validate_password(value)
-		except ValidationError as e:
-			raise serializers.ValidationError(e.messages)
-		return value
+		return _validate_password(value)
 	
 	def validate(self, attrs):
-		"""Check if passwords match"""
+		"""Check email/username availability in one query, then that passwords match"""
+		email, username = attrs['email'], attrs['username']
+		taken = User.objects.filter(Q(email=email) | Q(username=username)).values_list('email', 'username')
+		errors = {}
+		for taken_email, taken_username in taken:
+			if taken_email == email:
+				errors['email'] = ["A user with this email already exists."]
+			if taken_username == username:
+				errors['username'] = ["A user with this username already exists."]
+		if errors:
+			raise serializers.ValidationError(errors)
+		
 		if attrs['password'] != attrs['password_confirm']:
 			raise serializers.ValidationError("Passwords do not match.")
 		return attrs
@@ -52,27 +128,21 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
 		validated_data.pop('password_confirm')
 		phone_number = validated_data.pop('phone_number', None)
 		
-		# Create user
-		user = User.objects.create_user(**validated_data)
-		
-		# Create UserProfile with phone number
-		if phone_number:
-			UserProfile.objects.update_or_create(
-				user=user,
-				defaults={'phone_number': phone_number}
-			)
+		# No savepoint: when register() already holds a transaction there is nothing to roll back to
+		with transaction.atomic(savepoint=False):
+			# Create user; the post_save signal creates its UserProfile
+			user = User.objects.create_user(**validated_data)
+			
+			# Fill in the phone number on that new profile with a single UPDATE
+			if phone_number:
+				UserProfile.objects.filter(user=user).update(phone_number=phone_number)
 		
 		return user
 
 
 class ForgotPasswordSerializer(serializers.Serializer):
+	# Deliberately not checked against existing accounts, so responses don't reveal which emails are registered
 	email = serializers.EmailField()
-	
-	def validate_email(self, value):
-		"""Check if email exists in the system"""
-		if not User.objects.filter(email=value).exists():
-			raise serializers.ValidationError("No account found with this email address.")
-		return value
 
 
 class PasswordResetSerializer(serializers.Serializer):
@@ -82,11 +152,7 @@ class PasswordResetSerializer(serializers.Serializer):
 	
 	def validate_new_password(self, value):
 		"""Validate password using Django's password validators"""
-		try:
-			validate_password(value)
-		except ValidationError as e:
-			raise serializers.ValidationError(e.messages)
-		return value
+		return _validate_password(value)
 	
 	def validate(self, attrs):
 		"""Validate token and password confirmation"""
@@ -100,12 +166,9 @@ class PasswordResetSerializer(serializers.Serializer):
 		
 		# Validate token
 		try:
-			reset_token = PasswordResetToken.objects.get(token=token)
-			if not reset_token.is_valid():
-				raise serializers.ValidationError("Invalid or expired reset token.")
-			attrs['reset_token'] = reset_token
+			attrs['reset_token'] = PasswordResetToken.objects.valid().select_related('user').get(token=token)
 		except PasswordResetToken.DoesNotExist:
-			raise serializers.ValidationError("Invalid reset token.")
+			raise serializers.ValidationError("Invalid or expired reset token.")
 		
 		return attrs
 
@@ -117,11 +180,7 @@ class ChangePasswordSerializer(serializers.Serializer):
 	
 	def validate_new_password(self, value):
 		"""Validate password using Django's password validators"""
-		try:
-			validate_password(value)
-		except ValidationError as e:
-			raise serializers.ValidationError(e.messages)
-		return value
+		return _validate_password(value)
 	
 	def validate(self, attrs):
 		"""Validate current password and password confirmation"""
@@ -143,102 +202,168 @@ class ChangePasswordSerializer(serializers.Serializer):
 
 
 class ProfileImageSerializer(serializers.ModelSerializer):
-	profile_image_url = serializers.SerializerMethodField()
+	profile_image_url = _AbsoluteFileURLField(source='profile_image')
 	
 	class Meta:
 		model = UserProfile
 		fields = ('profile_image', 'profile_image_url')
 	
-	def get_profile_image_url(self, obj):
-		"""Return the full URL for the profile image"""
-		if obj.profile_image:
-			request = self.context.get('request')
-			if request:
-				return request.build_absolute_uri(obj.profile_image.url)
-			return obj.profile_image.url
-		return None
-	
 	def validate_profile_image(self, value):
 		"""Validate profile image"""
-		if value:
-			# Check file size (max 5MB)
-			max_size = 5 * 1024 * 1024
-			if value.size > max_size:
-				raise serializers.ValidationError("Image file too large. Maximum size is 5MB.")
-			
-			# Check file format
-			allowed_formats = ['jpeg', 'jpg', 'png', 'gif']
-			file_extension = value.name.split('.')[-1].lower()
-			if file_extension not in allowed_formats:
-				raise serializers.ValidationError(
-					f"Invalid file format. Allowed formats: {', '.join(allowed_formats)}"
-				)
-		
-		return value
+		return _validate_profile_image(value)
+
+
+class _NestedUserSerializer(serializers.ModelSerializer):
+	"""Read-only user summary embedded in profile responses"""
+	full_name = serializers.SerializerMethodField()
+	
+	class Meta:
+		model = User
+		fields = ('id', 'username', 'email', 'first_name', 'last_name', 'full_name', 'is_active', 'date_joined', 'last_login')
+		read_only_fields = fields
+	
+	def get_full_name(self, obj):
+		return f"{obj.first_name} {obj.last_name}".strip() or obj.username
 
 
 class UserProfileSerializer(serializers.ModelSerializer):
-	profile_image_url = serializers.SerializerMethodField()
-	user = serializers.SerializerMethodField()
+	profile_image_url = _AbsoluteFileURLField(source='profile_image')
+	user = _NestedUserSerializer(read_only=True)
+	
+	# Medical history lives on UserMedicalHistory but is exposed flat
+	chronic_conditions = serializers.CharField(source='medical.chronic_conditions', required=False, allow_null=True, allow_blank=True)
+	surgeries = serializers.CharField(source='medical.surgeries', required=False, allow_null=True, allow_blank=True)
+	allergies = serializers.CharField(source='medical.allergies', required=False, allow_null=True, allow_blank=True)
+	medications_current = serializers.CharField(source='medical.medications_current', required=False, allow_null=True, allow_blank=True)
+	family_history = serializers.CharField(source='medical.family_history', required=False, allow_null=True, allow_blank=True)
+	vaccinations = serializers.CharField(source='medical.vaccinations', required=False, allow_null=True, allow_blank=True)
 	
 	class Meta:
 		model = UserProfile
 		read_only_fields = ('id', 'created_at', 'updated_at')
 		fields = '__all__'
 	
-	def get_profile_image_url(self, obj):
-		"""Return the full URL for the profile image"""
-		if obj.profile_image:
-			request = self.context.get('request')
-			if request:
-				return request.build_absolute_uri(obj.profile_image.url)
-			return obj.profile_image.url
-		return None
-	
-	def get_user(self, obj):
-		"""Return user details"""
-		user = obj.user
-		return {
-			'id': user.id,
-			'username': user.username,
-			'email': user.email,
-			'first_name': user.first_name,
-			'last_name': user.last_name,
-			'full_name': (f"{user.first_name} {user.last_name}").strip() or user.username,
-			'is_active': user.is_active,
-			'date_joined': user.date_joined,
-			'last_login': user.last_login,
-		}
+	@classmethod
+	def setup_eager_loading(cls, queryset):
+		"""Join the nested user and the medical history row"""
+		return queryset.select_related('user', 'medical')
+	
+	def update(self, instance, validated_data):
+		"""Update the profile and write medical history through to its own row"""
+		medical_data = validated_data.pop('medical', None)
+		instance = super().update(instance, validated_data)
+		if medical_data:
+			instance.medical, _ = UserMedicalHistory.objects.update_or_create(
+				profile=instance,
+				defaults=medical_data
+			)
+		return instance
 	
 	def validate_profile_image(self, value):
 		"""Validate profile image"""
-		if value:
-			# Check file size (max 5MB)
-			max_size = 5 * 1024 * 1024
-			if value.size > max_size:
-				raise serializers.ValidationError("Image file too large. Maximum size is 5MB.")
-			
-			# Check file format
-			allowed_formats = ['jpeg', 'jpg', 'png', 'gif']
-			file_extension = value.name.split('.')[-1].lower()
-			if file_extension not in allowed_formats:
-				raise serializers.ValidationError(
-					f"Invalid file format. Allowed formats: {', '.join(allowed_formats)}"
-				)
+		return _validate_profile_image(value)
+
+
+# Fields counted towards profile completion; profile columns are reached through the join
+PROFILE_COMPLETION_FIELDS = (
+	'first_name', 'last_name', 'email',
+	'profile__profile_image', 'profile__date_of_birth', 'profile__sex', 'profile__phone_number',
+	'profile__address_line1', 'profile__city', 'profile__state', 'profile__country',
+	'profile__postal_code', 'profile__height_cm', 'profile__weight_kg', 'profile__occupation',
+)
+
+
+def _is_filled(path):
+	"""SQL equivalent of bool(value) for the field at path: not NULL, blank or zero"""
+	model, name = (UserProfile, path.split('__', 1)[1]) if path.startswith('profile__') else (User, path)
+	field = model._meta.get_field(name)
+	condition = Q(**{f'{path}__isnull': False})
+	if isinstance(field, (models.CharField, models.FileField)):
+		condition &= ~Q(**{path: ''})
+	elif isinstance(field, models.FloatField):
+		condition &= ~Q(**{path: 0})
+	return condition
+
+
+def _profile_completed_fields():
+	"""Number of PROFILE_COMPLETION_FIELDS that are filled in; users without a profile only count their own"""
+	return reduce(operator.add, (
+		Case(When(_is_filled(path), then=Value(1)), default=Value(0), output_field=models.IntegerField())
+		for path in PROFILE_COMPLETION_FIELDS
+	))
+
+
+class _BooleanLabelField(serializers.ReadOnlyField):
+	"""Renders a boolean attribute as one of two fixed labels (False, True)"""
+	def __init__(self, labels, **kwargs):
+		self.labels = labels
+		super().__init__(**kwargs)
+	
+	def to_representation(self, value):
+		return self.labels[bool(value)]
+
+
+class _BoundMethodField(serializers.SerializerMethodField):
+	"""
+	SerializerMethodField that resolves its get_<name> method once at bind time.
+	A many=True list reuses one child serializer, so the bound method stays valid for every row.
+	"""
+	def bind(self, field_name, parent):
+		super().bind(field_name, parent)
+		self._method = getattr(parent, self.method_name)
+	
+	def to_representation(self, value):
+		return self._method(value)
+
+
+@memoize
+def _source_columns(serializer_class):
+	"""Columns of the serializer's model read by its fields, derived from their sources"""
+	concrete = {field.name for field in serializer_class.Meta.model._meta.concrete_fields}
+	return tuple(dict.fromkeys(
+		field.source for field in serializer_class().fields.values() if field.source in concrete
+	))
+
+
+def _format_minutes(dt):
+	"""Same output as dt.strftime("%Y-%m-%d %H:%M") without strftime's per-call format parsing"""
+	return f"{dt.year:04d}-{dt.month:02d}-{dt.day:02d} {dt.hour:02d}:{dt.minute:02d}"
+
+
+class UserBatchListSerializer(serializers.ListSerializer):
+	"""
+	Fills in, with one query each, whatever setup_eager_loading didn't load for a page of users
+	"""
+	def to_representation(self, data):
+		users = list(data.all() if isinstance(data, models.manager.BaseManager) else data)
 		
-		return value
+		missing_profile = [user for user in users if not User.profile.is_cached(user)]
+		if missing_profile:
+			prefetch_related_objects(missing_profile, 'profile')
+		
+		missing_completion = [user for user in users if not hasattr(user, 'profile_completed_fields')]
+		if missing_completion:
+			counts = dict(
+				User.objects.filter(pk__in=[user.pk for user in missing_completion])
+				.annotate(completed=_profile_completed_fields())
+				.values_list('pk', 'completed')
+			)
+			for user in missing_completion:
+				user.profile_completed_fields = counts[user.pk]
+		
+		return super().to_representation(users)
 
 
 class UserListSerializer(serializers.ModelSerializer):
 	"""
 	Serializer for user listing - excludes sensitive information
 	"""
-	profile_image_url = serializers.SerializerMethodField()
-	full_name = serializers.SerializerMethodField()
-	profile_completion = serializers.SerializerMethodField()
-	last_login_formatted = serializers.SerializerMethodField()
-	date_joined_formatted = serializers.SerializerMethodField()
-	is_active_status = serializers.SerializerMethodField()
+	profile_image_url = _AbsoluteFileURLField(source='profile.profile_image')
+	full_name = _BoundMethodField()
+	profile_completion = _BoundMethodField()
+	last_login_formatted = _BoundMethodField()
+	date_joined_formatted = _BoundMethodField()
+	is_active_status = _BooleanLabelField(source='is_active', labels=('Inactive', 'Active'))
 	
 	class Meta:
 		model = User
@@ -259,18 +384,20 @@ class UserListSerializer(serializers.ModelSerializer):
 			'profile_completion'
 		]
 		read_only_fields = ['id', 'date_joined', 'last_login']
+		list_serializer_class = UserBatchListSerializer
 	
-	def get_profile_image_url(self, obj):
-		"""Get profile image URL if exists"""
-		try:
-			if obj.profile.profile_image:
-				request = self.context.get('request')
-				if request:
-					return request.build_absolute_uri(obj.profile.profile_image.url)
-				return obj.profile.profile_image.url
-		except UserProfile.DoesNotExist:
-			pass
-		return None
+	@classmethod
+	def setup_eager_loading(cls, queryset):
+		"""Load only the columns the list renders; profile completion is counted in SQL"""
+		return queryset.select_related('profile').only(
+			*cls.user_columns(), 'profile__profile_image'
+		).annotate(profile_completed_fields=_profile_completed_fields())
+	
+	@classmethod
+	def user_columns(cls):
+		"""User columns read by this serializer's fields, derived from their sources"""
+		# Method fields aren't introspectable; full_name only reads columns already listed here
+		return _source_columns(cls)
 	
 	def get_full_name(self, obj):
 		"""Get user's full name"""
@@ -283,65 +410,18 @@ class UserListSerializer(serializers.ModelSerializer):
 		return obj.username
 	
 	def get_profile_completion(self, obj):
-		"""Calculate profile completion percentage"""
-		try:
-			profile = obj.profile
-			total_fields = 15  # Key profile fields to check
-			completed_fields = 0
-			
-			# Check basic user fields
-			if obj.first_name:
-				completed_fields += 1
-			if obj.last_name:
-				completed_fields += 1
-			if obj.email:
-				completed_fields += 1
-			
-			# Check profile fields
-			if profile.profile_image:
-				completed_fields += 1
-			if profile.date_of_birth:
-				completed_fields += 1
-			if profile.sex:
-				completed_fields += 1
-			if profile.phone_number:
-				completed_fields += 1
-			if profile.address_line1:
-				completed_fields += 1
-			if profile.city:
-				completed_fields += 1
-			if profile.state:
-				completed_fields += 1
-			if profile.country:
-				completed_fields += 1
-			if profile.postal_code:
-				completed_fields += 1
-			if profile.height_cm:
-				completed_fields += 1
-			if profile.weight_kg:
-				completed_fields += 1
-			if profile.occupation:
-				completed_fields += 1
-			
-			return round((completed_fields / total_fields) * 100, 1)
-		except UserProfile.DoesNotExist:
-			# Only basic user fields completed
-			basic_completed = sum([1 for field in [obj.first_name, obj.last_name, obj.email] if field])
-			return round((basic_completed / total_fields) * 100, 1)
+		"""Profile completion percentage from the profile_completed_fields annotation"""
+		return round((obj.profile_completed_fields / len(PROFILE_COMPLETION_FIELDS)) * 100, 1)
 	
 	def get_last_login_formatted(self, obj):
 		"""Get formatted last login date"""
 		if obj.last_login:
-			return obj.last_login.strftime("%Y-%m-%d %H:%M")
+			return _format_minutes(obj.last_login)
 		return "Never"
 	
 	def get_date_joined_formatted(self, obj):
 		"""Get formatted date joined"""
-		return obj.date_joined.strftime("%Y-%m-%d %H:%M")
-	
-	def get_is_active_status(self, obj):
-		"""Get user active status as text"""
-		return "Active" if obj.is_active else "Inactive"
+		return _format_minutes(obj.date_joined)
 
 
 class UserDetailSerializer(UserListSerializer):
@@ -355,6 +435,26 @@ class UserDetailSerializer(UserListSerializer):
 			'profile',
 			'is_staff',
 		]
+	
+	@classmethod
+	def setup_eager_loading(cls, queryset):
+		"""The nested profile serializer needs every profile column plus the medical history it shows"""
+		return queryset.select_related('profile', 'profile__medical').only(
+			*cls.user_columns(), *_detail_profile_columns()
+		).annotate(
+			profile_completed_fields=_profile_completed_fields()
+		)
+
+
+@memoize
+def _detail_profile_columns():
+	"""profile__ paths for every profile column and each medical column UserProfileSerializer renders"""
+	profile = [f'profile__{field.name}' for field in UserProfile._meta.concrete_fields]
+	medical = [
+		'profile__' + field.source.replace('.', '__')
+		for field in UserProfileSerializer().fields.values() if field.source.startswith('medical.')
+	]
+	return tuple(profile + medical)
 
 
 class SubscriptionPlanSerializer(serializers.ModelSerializer):
@@ -363,7 +463,7 @@ class SubscriptionPlanSerializer(serializers.ModelSerializer):
 	"""
 	is_free = serializers.ReadOnlyField()
 	monthly_price = serializers.ReadOnlyField()
-	features = serializers.SerializerMethodField()
+	features = serializers.ReadOnlyField()
 	
 	class Meta:
 		model = SubscriptionPlan
@@ -386,33 +486,50 @@ class SubscriptionPlanSerializer(serializers.ModelSerializer):
 			'features'
 		]
 	
-	def get_features(self, obj):
-		"""Get formatted feature list"""
-		features = []
-		
-		if obj.dna_kits_included > 0:
-			features.append(f"{obj.dna_kits_included} DNA kits included")
-		elif obj.dna_kits_included == 0 and obj.plan_type != 'FREE':
-			features.append("Unlimited DNA kits")
-		
-		if obj.mood_entries_limit > 0:
-			features.append(f"{obj.mood_entries_limit} mood entries per month")
-		elif obj.mood_entries_limit == 0 and obj.plan_type != 'FREE':
-			features.append("Unlimited mood entries")
-		
-		if obj.ai_insights_enabled:
-			features.append("AI-powered insights")
-		
-		if obj.priority_support:
-			features.append("Priority customer support")
-		
-		if obj.data_export_enabled:
-			features.append("Data export capabilities")
-		
-		if obj.api_access_enabled:
-			features.append("API access")
-		
-		return features
+	@classmethod
+	def plan_columns(cls):
+		"""Plan columns rendered here; features and is_free only read these, updated_at keys the cache"""
+		return _source_columns(cls) + ('updated_at',)
+	
+	@classmethod
+	def setup_eager_loading(cls, queryset):
+		"""Skip the plan columns the payload never shows"""
+		return queryset.only(*cls.plan_columns())
+	
+	def to_representation(self, instance):
+		# Plans change rarely; reuse the payload until the row is saved again
+		if instance.pk is None or instance.updated_at is None:
+			return super().to_representation(instance)
+		return cache.get_or_set(
+			subscription_plan_cache_key(instance),
+			lambda: super(SubscriptionPlanSerializer, self).to_representation(instance),
+			SUBSCRIPTION_PLAN_CACHE_TIMEOUT,
+		)
+
+
+@memoize
+def _plan_field_readers():
+	"""(name, getter, to_representation) per plan field, resolved once from a serializer instance"""
+	return tuple(
+		(field.field_name, operator.attrgetter(field.source), field.to_representation)
+		for field in SubscriptionPlanSerializer()._readable_fields
+	)
+
+
+def serialize_plans(plans):
+	"""
+	SubscriptionPlanSerializer output for many plans without the per-object field walk.
+	Only valid because every plan field is a plain attribute with a scalar or list value.
+	"""
+	readers = _plan_field_readers()
+	data = []
+	for plan in plans:
+		row = {}
+		for name, get, to_representation in readers:
+			value = get(plan)
+			row[name] = None if value is None else to_representation(value)
+		data.append(row)
+	return data
 
 
 class UserSubscriptionSerializer(serializers.ModelSerializer):
@@ -451,6 +568,32 @@ class UserSubscriptionSerializer(serializers.ModelSerializer):
 			'id', 'start_date', 'dna_kits_used', 'mood_entries_this_month',
 			'last_payment_date', 'last_payment_amount'
 		]
+	
+	@classmethod
+	def setup_eager_loading(cls, queryset):
+		"""Join the plan rendered by the nested plan serializer, loading only rendered columns"""
+		# is_active and days_remaining only read status and end_date, both rendered
+		return queryset.select_related('plan').only(
+			*_source_columns(cls),
+			*(f'plan__{column}' for column in SubscriptionPlanSerializer.plan_columns()),
+		)
+	
+	# Fields that move with the clock; cached payloads leave them out
+	time_dependent_fields = ('is_active', 'days_remaining')
+	
+	@classmethod
+	def cacheable_data(cls, data):
+		"""The serialized payload without the time-dependent fields"""
+		return {field: value for field, value in data.items() if field not in cls.time_dependent_fields}
+	
+	@classmethod
+	def with_time_dependent_fields(cls, data):
+		"""Complete a cached payload with is_active and days_remaining computed for now"""
+		subscription = UserSubscription(status=data['status'], end_date=data['end_date'] and parse_datetime(data['end_date']))
+		return {
+			field: getattr(subscription, field) if field in cls.time_dependent_fields else data[field]
+			for field in cls.Meta.fields
+		}
 
 
 class SubscriptionUpgradeSerializer(serializers.Serializer):
@@ -460,13 +603,16 @@ class SubscriptionUpgradeSerializer(serializers.Serializer):
 	plan_id = serializers.IntegerField()
 	payment_method = serializers.ChoiceField(choices=UserSubscription.PAYMENT_METHODS, default='CREDIT_CARD')
 	
-	def validate_plan_id(self, value):
-		"""Validate that the plan exists and is active"""
+	def validate(self, attrs):
+		"""Validate that the plan exists and is active, handing the loaded plan to the view"""
+		# The view only writes plan_id and renders the plan, so load just the rendered columns
 		try:
-			plan = SubscriptionPlan.objects.get(id=value, is_active=True)
+			attrs['plan'] = SubscriptionPlanSerializer.setup_eager_loading(SubscriptionPlan.objects).get(
+				id=attrs['plan_id'], is_active=True
+			)
 		except SubscriptionPlan.DoesNotExist:
-			raise serializers.ValidationError("Invalid or inactive subscription plan.")
-		return value
+			raise serializers.ValidationError({'plan_id': "Invalid or inactive subscription plan."})
+		return attrs
 
 
 class SubscriptionHistorySerializer(serializers.ModelSerializer):
@@ -489,6 +635,13 @@ class SubscriptionHistorySerializer(serializers.ModelSerializer):
 			'notes',
 			'created_at'
 		]
+	
+	@classmethod
+	def setup_eager_loading(cls, queryset):
+		"""Join the plans behind old_plan_name and new_plan_name, loading only their names"""
+		return queryset.select_related('old_plan', 'new_plan').only(
+			*_source_columns(cls), 'old_plan__name', 'new_plan__name'
+		)
 
 
 class SubscriptionUsageSerializer(serializers.Serializer):
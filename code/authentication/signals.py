@@ -1,11 +1,54 @@
 from django.contrib.auth.models import User
-from django.db.models.signals import post_save
+from django.core.cache import cache
+from django.db.models.signals import post_delete, post_migrate, post_save
 from django.dispatch import receiver
 
-from .models import UserProfile
+from .models import (
+	SubscriptionPlan,
+	UserProfile,
+	UserSubscription,
+	bump_subscription_plans_version,
+	clear_free_plan_cache,
+	get_free_plan_id,
+	subscription_plan_cache_key,
+	user_subscription_cache_keys,
+)
 
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance: User, created: bool, **kwargs):
 	if created:
-		UserProfile.objects.create(user=instance) 
\ No newline at end of file
+		# The user row is brand new, so plain creates are one INSERT each
+		UserProfile.objects.create(user=instance)
+		UserSubscription.objects.create(
+			user=instance,
+			plan_id=get_free_plan_id(),
+			status=UserSubscription.Status.ACTIVE,
+			payment_method='FREE'
+		)
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=SubscriptionPlan)
+@receiver(post_migrate)  # also sent by flush, which empties the plans table
+def reset_free_plan_cache(sender, **kwargs):
+	clear_free_plan_cache()
+
+
+@receiver(post_delete, sender=SubscriptionPlan)
+def drop_cached_plan(sender, instance: SubscriptionPlan, **kwargs):
+	# Saves already switch to a fresh key; only deletes leave an entry behind
+	cache.delete(subscription_plan_cache_key(instance))
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=SubscriptionPlan)
+def invalidate_plan_list_cache(sender, **kwargs):
+	# Also retires every cached per-user subscription payload, since they embed the plan
+	bump_subscription_plans_version()
+
+
+@receiver(post_save, sender=UserSubscription)
+@receiver(post_delete, sender=UserSubscription)
+def invalidate_user_subscription_cache(sender, instance: UserSubscription, **kwargs):
+	cache.delete_many(user_subscription_cache_keys(instance.user_id))
@@ -0,0 +1,31 @@
+from django.urls import path
+from .subscription_views import (
+    SubscriptionPlanListView,
+    SubscriptionPlanDetailView,
+    MySubscriptionView,
+    subscription_usage,
+    upgrade_subscription,
+    cancel_subscription,
+    SubscriptionHistoryListView,
+    AdminSubscriptionListView,
+    AdminSubscriptionCursorListView,
+    AdminSubscriptionPlanView,
+    AdminSubscriptionPlanDetailView,
+)
+
+# Included under subscription/ by authentication.urls; names stay in the authentication namespace
+urlpatterns = [
+	path('plans/', SubscriptionPlanListView.as_view(), name='subscription-plans'),
+	path('plans/<int:pk>/', SubscriptionPlanDetailView.as_view(), name='subscription-plan-detail'),
+	path('my-subscription/', MySubscriptionView.as_view(), name='my-subscription'),
+	path('usage/', subscription_usage, name='subscription-usage'),
+	path('upgrade/', upgrade_subscription, name='upgrade-subscription'),
+	path('cancel/', cancel_subscription, name='cancel-subscription'),
+	path('history/', SubscriptionHistoryListView.as_view(), name='subscription-history'),
+	
+	# Admin subscription endpoints
+	path('admin/subscriptions/', AdminSubscriptionListView.as_view(), name='admin-subscriptions'),
+	path('admin/v2/subscriptions/', AdminSubscriptionCursorListView.as_view(), name='admin-subscriptions-v2'),
+	path('admin/plans/', AdminSubscriptionPlanView.as_view(), name='admin-subscription-plans'),
+	path('admin/plans/<int:pk>/', AdminSubscriptionPlanDetailView.as_view(), name='admin-subscription-plan-detail'),
+]
@@ -1,14 +1,35 @@
+import hashlib
+import json
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser, BasePermission
 from rest_framework.response import Response
 from rest_framework import generics, status, filters
+from rest_framework.utils.encoders import JSONEncoder
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Q
+from django.db.models.functions import Now
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from drf_spectacular.utils import extend_schema
-from aevum.pagination import StandardResultsPagination, SmallResultsPagination
+from aevum.mixins import JSONLinesExportMixin
+from aevum.pagination import StandardCursorPagination, StandardResultsPagination, SmallResultsPagination
 
-from .models import SubscriptionPlan, UserSubscription, SubscriptionHistory
+from .models import (
+    SubscriptionPlan,
+    UserSubscription,
+    SubscriptionHistory,
+    SUBSCRIPTION_PLAN_LIST_CACHE_TIMEOUT,
+    SUBSCRIPTION_USAGE_CACHE_TIMEOUT,
+    USER_SUBSCRIPTION_CACHE_TIMEOUT,
+    get_free_plan_id,
+    subscription_plan_list_cache_key,
+    user_subscription_cache_keys,
+)
 
 
 class IsSuperAdminOrStaff(BasePermission):
@@ -21,14 +42,16 @@ class IsSuperAdminOrStaff(BasePermission):
             request.user.is_authenticated and 
             (request.user.is_superuser or request.user.is_staff)
         )
-from .subscription_serializers import (
+from .serializers import (
     SubscriptionPlanSerializer,
     UserSubscriptionSerializer,
     SubscriptionUpgradeSerializer,
     SubscriptionHistorySerializer,
     SubscriptionUsageSerializer,
-    CancelSubscriptionSerializer
+    CancelSubscriptionSerializer,
+    serialize_plans,
 )
+from .tasks import schedule_subscription_history
 
 
 # Subscription Plans Views
@@ -46,12 +69,22 @@ class SubscriptionPlanListView(generics.ListAPIView):
     permission_classes = [AllowAny]
     pagination_class = SmallResultsPagination
     filter_backends = [filters.OrderingFilter]
-    ordering_fields = ['price', 'sort_order', 'name']
+    ordering_fields = ['price', 'monthly_price', 'sort_order', 'name']
     ordering = ['sort_order', 'price']
     
     def get_queryset(self):
         """Get active subscription plans"""
-        return SubscriptionPlan.objects.filter(is_active=True)
+        return self.serializer_class.setup_eager_loading(SubscriptionPlan.objects.filter(is_active=True))
+    
+    def list(self, request, *args, **kwargs):
+        # Same payload for every caller; keyed on the query string (page, ordering)
+        cache_key = subscription_plan_list_cache_key(request.GET.urlencode())
+        data = cache.get(cache_key)
+        if data is None:
+            page = self.paginate_queryset(self.filter_queryset(self.get_queryset()))
+            data = self.get_paginated_response(serialize_plans(page)).data
+            cache.set(cache_key, data, SUBSCRIPTION_PLAN_LIST_CACHE_TIMEOUT)
+        return Response(data)
 
 
 @extend_schema(
@@ -67,7 +100,7 @@ class SubscriptionPlanDetailView(generics.RetrieveAPIView):
     permission_classes = [AllowAny]
     
     def get_queryset(self):
-        return SubscriptionPlan.objects.filter(is_active=True)
+        return self.serializer_class.setup_eager_loading(SubscriptionPlan.objects.filter(is_active=True))
 
 
 # User Subscription Views
@@ -86,84 +119,83 @@ class MySubscriptionView(generics.RetrieveAPIView):
     
     def get_object(self):
         """Get or create user subscription"""
-        subscription, created = UserSubscription.objects.get_or_create(
-            user=self.request.user,
-            defaults={
-                'plan': self._get_free_plan(),
-                'status': 'ACTIVE',
-                'payment_method': 'FREE'
-            }
-        )
+        subscription = self.serializer_class.setup_eager_loading(
+            UserSubscription.objects.filter(user=self.request.user)
+        ).first()
+        if subscription is None:
+            # Only users created before the signup signal lack a subscription
+            subscription = UserSubscription.objects.create(
+                user=self.request.user,
+                plan_id=get_free_plan_id(),
+                status=UserSubscription.Status.ACTIVE,
+                payment_method='FREE'
+            )
         return subscription
     
-    def _get_free_plan(self):
-        """Get the default free plan"""
-        free_plan, created = SubscriptionPlan.objects.get_or_create(
-            plan_type='FREE',
-            defaults={
-                'name': 'Free Plan',
-                'description': 'Basic features at no cost',
-                'price': 0.00,
-                'billing_cycle': 'MONTHLY',
-                'dna_kits_included': 1,
-                'mood_entries_limit': 30,
-                'ai_insights_enabled': False,
-                'priority_support': False,
-                'data_export_enabled': False,
-                'api_access_enabled': False,
-            }
+    def retrieve(self, request, *args, **kwargs):
+        if not settings.CACHE_USER_SUBSCRIPTIONS:
+            return super().retrieve(request, *args, **kwargs)
+        # Served from cache until the subscription (or any plan) changes
+        cache_key, _ = user_subscription_cache_keys(request.user.id)
+        data = cache.get_or_set(
+            cache_key,
+            lambda: self.serializer_class.cacheable_data(self.get_serializer(self.get_object()).data),
+            USER_SUBSCRIPTION_CACHE_TIMEOUT,
         )
-        return free_plan
+        return Response(self.serializer_class.with_time_dependent_fields(data))
 
 
-@extend_schema(
-    tags=['Authentication'],
-    summary='Get Subscription Usage',
-    description='Get detailed usage statistics for the current user\'s subscription.'
-)
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def subscription_usage(request):
-    """
-    Get subscription usage statistics
-    """
+def _subscription_usage_data(user):
+    """Serialized usage statistics for the user, or None when they have no subscription"""
     try:
-        subscription = request.user.subscription
+        subscription = UserSubscription.objects.with_usage().select_related('plan').get(user=user)
     except UserSubscription.DoesNotExist:
-        return Response({
-            'error': 'No subscription found'
-        }, status=status.HTTP_404_NOT_FOUND)
-    
-    # Calculate usage statistics
-    dna_kits_limit = subscription.plan.dna_kits_included
-    dna_kits_remaining = max(0, dna_kits_limit - subscription.dna_kits_used) if dna_kits_limit > 0 else -1
-    
-    mood_entries_limit = subscription.plan.mood_entries_limit
-    mood_entries_remaining = max(0, mood_entries_limit - subscription.mood_entries_this_month) if mood_entries_limit > 0 else -1
+        return None
     
     # Features availability
-    features_available = {
-        'dna_kits': subscription.can_use_feature('dna_kits'),
-        'mood_entries': subscription.can_use_feature('mood_entries'),
-        'ai_insights': subscription.can_use_feature('ai_insights'),
-        'priority_support': subscription.can_use_feature('priority_support'),
-        'data_export': subscription.can_use_feature('data_export'),
-        'api_access': subscription.can_use_feature('api_access'),
-    }
+    features_available = subscription.feature_availability_map()
     
     usage_data = {
         'dna_kits_used': subscription.dna_kits_used,
-        'dna_kits_limit': dna_kits_limit,
-        'dna_kits_remaining': dna_kits_remaining,
+        'dna_kits_limit': subscription.plan.dna_kits_included,
+        'dna_kits_remaining': subscription.dna_kits_remaining,
         'mood_entries_this_month': subscription.mood_entries_this_month,
-        'mood_entries_limit': mood_entries_limit,
-        'mood_entries_remaining': mood_entries_remaining,
+        'mood_entries_limit': subscription.plan.mood_entries_limit,
+        'mood_entries_remaining': subscription.mood_entries_remaining,
         'features_available': features_available,
         'usage_percentages': subscription.usage_percentage
     }
     
-    serializer = SubscriptionUsageSerializer(usage_data)
-    return Response(serializer.data)
+    return SubscriptionUsageSerializer(usage_data).data
+
+
+@extend_schema(
+    tags=['Authentication'],
+    summary='Get Subscription Usage',
+    description='Get detailed usage statistics for the current user\'s subscription.'
+)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def subscription_usage(request):
+    """
+    Get subscription usage statistics
+    """
+    # Counters move more often than the plan, so usage gets a shorter timeout
+    _, cache_key = user_subscription_cache_keys(request.user.id)
+    data = cache.get(cache_key) if settings.CACHE_USER_SUBSCRIPTIONS else None
+    if data is None:
+        data = _subscription_usage_data(request.user)
+        if data is None:
+            return Response({
+                'error': 'No subscription found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        if settings.CACHE_USER_SUBSCRIPTIONS:
+            cache.set(cache_key, data, SUBSCRIPTION_USAGE_CACHE_TIMEOUT)
+    
+    # The ETag hashes the payload itself, so plan edits change it as well as usage.
+    # A matching If-None-Match gets a 304 without rendering the body.
+    etag = quote_etag(hashlib.md5(json.dumps(data, sort_keys=True, cls=JSONEncoder).encode(), usedforsecurity=False).hexdigest())
+    return get_conditional_response(request, etag=etag, response=Response(data, headers={'ETag': etag}))
 
 
 @extend_schema(
@@ -181,60 +213,54 @@ def upgrade_subscription(request):
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
     
-    plan_id = serializer.validated_data['plan_id']
+    # Loaded once by the serializer; reused for the write and the response payload
+    new_plan = serializer.validated_data['plan']
     payment_method = serializer.validated_data['payment_method']
     
-    try:
-        new_plan = SubscriptionPlan.objects.get(id=plan_id, is_active=True)
-    except SubscriptionPlan.DoesNotExist:
-        return Response({
-            'error': 'Invalid subscription plan'
-        }, status=status.HTTP_400_BAD_REQUEST)
-    
-    # Get or create user subscription
-    subscription, created = UserSubscription.objects.get_or_create(
-        user=request.user,
-        defaults={
-            'plan': new_plan,
-            'status': 'ACTIVE',
-            'payment_method': payment_method
-        }
-    )
-    
-    if not created:
-        # Update existing subscription
-        old_plan = subscription.plan
-        subscription.upgrade_plan(new_plan)
+    # One transaction and one subscription write; history is recorded once it commits.
+    # The row lock serialises concurrent upgrades/cancellations for the same user.
+    with transaction.atomic():
+        subscription = UserSubscription.objects.select_for_update(of=('self',)).select_related('plan').filter(
+            user=request.user
+        ).first()
+        created = subscription is None
+        old_plan = None if created else subscription.plan
+        if created:
+            subscription = UserSubscription(user=request.user)
+        
+        subscription.plan = new_plan
+        subscription.status = UserSubscription.Status.ACTIVE
         subscription.payment_method = payment_method
-        subscription.save()
+        update_fields = ['plan', 'status', 'payment_method', 'updated_at']
         
-        # Create history record
-        SubscriptionHistory.objects.create(
-            user=request.user,
-            subscription=subscription,
-            action_type='UPGRADED',
-            old_plan=old_plan,
-            new_plan=new_plan,
-            amount=new_plan.price,
-            notes=f"Upgraded from {old_plan.name} to {new_plan.name}"
-        )
-    else:
-        # Create history record for new subscription
-        SubscriptionHistory.objects.create(
-            user=request.user,
-            subscription=subscription,
-            action_type='CREATED',
-            new_plan=new_plan,
-            amount=new_plan.price,
-            notes=f"Created new subscription with {new_plan.name}"
-        )
-    
-    # In a real implementation, you would integrate with payment processor here
-    # For now, we'll simulate successful payment for non-free plans
-    if not new_plan.is_free:
-        subscription.last_payment_date = timezone.now()
-        subscription.last_payment_amount = new_plan.price
-        subscription.save()
+        # In a real implementation, you would integrate with payment processor here
+        # For now, we'll simulate successful payment for non-free plans
+        if not new_plan.is_free:
+            subscription.last_payment_date = timezone.now()
+            subscription.last_payment_amount = new_plan.price
+            update_fields += ['last_payment_date', 'last_payment_amount']
+        
+        if created:
+            subscription.save()
+            schedule_subscription_history(
+                user_id=request.user.id,
+                subscription_id=subscription.id,
+                action_type='CREATED',
+                new_plan_id=new_plan.id,
+                amount=new_plan.price,
+                notes=f"Created new subscription with {new_plan.name}"
+            )
+        else:
+            subscription.save(update_fields=update_fields)
+            schedule_subscription_history(
+                user_id=request.user.id,
+                subscription_id=subscription.id,
+                action_type='UPGRADED',
+                old_plan_id=old_plan.id,
+                new_plan_id=new_plan.id,
+                amount=new_plan.price,
+                notes=f"Upgraded from {old_plan.name} to {new_plan.name}"
+            )
     
     return Response({
         'message': 'Subscription upgraded successfully',
@@ -253,13 +279,6 @@ def cancel_subscription(request):
     """
     Cancel user's subscription
     """
-    try:
-        subscription = request.user.subscription
-    except UserSubscription.DoesNotExist:
-        return Response({
-            'error': 'No active subscription found'
-        }, status=status.HTTP_404_NOT_FOUND)
-    
     serializer = CancelSubscriptionSerializer(data=request.data)
     if not serializer.is_valid():
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
@@ -267,17 +286,25 @@ def cancel_subscription(request):
     reason = serializer.validated_data.get('reason', '')
     immediate = serializer.validated_data.get('immediate', False)
     
-    # Cancel the subscription
-    subscription.cancel_subscription(reason)
-    
-    # Create history record
-    SubscriptionHistory.objects.create(
-        user=request.user,
-        subscription=subscription,
-        action_type='CANCELLED',
-        old_plan=subscription.plan,
-        notes=f"Subscription cancelled. Reason: {reason}" if reason else "Subscription cancelled"
-    )
+    with transaction.atomic():
+        try:
+            subscription = UserSubscription.objects.select_for_update().get(user=request.user)
+        except UserSubscription.DoesNotExist:
+            return Response({
+                'error': 'No active subscription found'
+            }, status=status.HTTP_404_NOT_FOUND)
+        
+        # Cancel the subscription
+        subscription.cancel_subscription(reason)
+        
+        # Record history once the cancellation commits
+        schedule_subscription_history(
+            user_id=request.user.id,
+            subscription_id=subscription.id,
+            action_type='CANCELLED',
+            old_plan_id=subscription.plan_id,
+            notes=f"Subscription cancelled. Reason: {reason}" if reason else "Subscription cancelled"
+        )
     
     return Response({
         'message': 'Subscription cancelled successfully',
@@ -291,7 +318,7 @@ def cancel_subscription(request):
     summary='Subscription History',
     description='Get the current user\'s subscription history and payment records.'
 )
-class SubscriptionHistoryListView(generics.ListAPIView):
+class SubscriptionHistoryListView(JSONLinesExportMixin, generics.ListAPIView):
     """
     Get user's subscription history
     """
@@ -301,7 +328,9 @@ class SubscriptionHistoryListView(generics.ListAPIView):
     ordering = ['-created_at']
     
     def get_queryset(self):
-        return SubscriptionHistory.objects.filter(user=self.request.user)
+        return self.serializer_class.setup_eager_loading(
+            SubscriptionHistory.objects.filter(user=self.request.user)
+        )
 
 
 # Admin Views for Subscription Management
@@ -311,7 +340,7 @@ class SubscriptionHistoryListView(generics.ListAPIView):
     summary='Admin - List All Subscriptions',
     description='Admin endpoint to list all user subscriptions with filtering options. Requires superadmin or staff privileges.'
 )
-class AdminSubscriptionListView(generics.ListAPIView):
+class AdminSubscriptionListView(JSONLinesExportMixin, generics.ListAPIView):
     """
     Admin view to list all user subscriptions
     """
@@ -324,7 +353,7 @@ class AdminSubscriptionListView(generics.ListAPIView):
     ordering = ['-created_at']
     
     def get_queryset(self):
-        queryset = UserSubscription.objects.select_related('user', 'plan')
+        queryset = self.serializer_class.setup_eager_loading(UserSubscription.objects.with_usage())
         
         # Filter by status
         status_filter = self.request.query_params.get('status')
@@ -339,20 +368,30 @@ class AdminSubscriptionListView(generics.ListAPIView):
         # Filter by active/inactive
         is_active = self.request.query_params.get('is_active')
         if is_active is not None:
-            if is_active.lower() == 'true':
-                queryset = queryset.filter(
-                    status='ACTIVE',
-                    end_date__gte=timezone.now()
-                )
-            else:
-                queryset = queryset.exclude(
-                    status='ACTIVE',
-                    end_date__gte=timezone.now()
-                )
+            # Now() is evaluated by the database, so the SQL text is identical across requests
+            active_q = Q(status=UserSubscription.Status.ACTIVE, end_date__gte=Now())
+            queryset = queryset.filter(active_q if is_active.lower() == 'true' else ~active_q)
         
         return queryset
 
 
+@extend_schema(
+    tags=['Authentication'],
+    summary='Admin - List All Subscriptions (cursor pages)',
+    description='Same filters as the admin subscription list, paged by cursor instead of page number. Requires superadmin or staff privileges.'
+)
+class AdminSubscriptionCursorListView(AdminSubscriptionListView):
+    """
+    Admin subscription list paged by keyset instead of OFFSET.
+    The cursor encodes the ordering column, so only the unique, non-null, indexed
+    created_at (id breaks ties) can be ordered on; the page-number endpoint keeps
+    count/total_pages for existing clients.
+    """
+    pagination_class = StandardCursorPagination
+    ordering_fields = ['created_at']
+    ordering = ['-created_at', '-id']
+
+
 @extend_schema(
     tags=['Authentication'],
     summary='Admin - Create/Update Subscription Plan',
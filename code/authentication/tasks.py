@@ -0,0 +1,45 @@
+from datetime import datetime
+from functools import partial
+
+from django.conf import settings
+from django.core.mail import send_mail
+from django.db import transaction
+from django.template.loader import render_to_string
+
+from .models import SubscriptionHistory
+
+
+def send_password_reset_email(email, user_name, token):
+	"""Render and send the reset email; takes plain values so it never touches the database"""
+	reset_url = f"{settings.SITE_URL or 'http://localhost:3000'}/reset-password?token={token}"
+	context = {
+		'user_name': user_name,
+		'reset_url': reset_url,
+		'current_year': datetime.now().year,
+	}
+	send_mail(
+		subject='Password Reset - Aevum Health',
+		message=render_to_string('emails/password_reset.txt', context),
+		from_email=settings.DEFAULT_FROM_EMAIL,
+		recipient_list=[email],
+		html_message=render_to_string('emails/password_reset.html', context),
+		fail_silently=False,
+	)
+
+
+def record_subscription_history(user_id, subscription_id, action_type, old_plan_id=None, new_plan_id=None, amount=None, notes=None):
+	"""Insert one SubscriptionHistory row; takes ids only so it can run from a queue"""
+	SubscriptionHistory.objects.create(
+		user_id=user_id,
+		subscription_id=subscription_id,
+		action_type=action_type,
+		old_plan_id=old_plan_id,
+		new_plan_id=new_plan_id,
+		amount=amount,
+		notes=notes,
+	)
+
+
+def schedule_subscription_history(**fields):
+	"""Record history after the current transaction commits, outside its row locks"""
+	transaction.on_commit(partial(record_subscription_history, **fields))
@@ -14,20 +14,6 @@ from .views import (
     UserDetailView
 )
 
-# Import subscription views
-from .subscription_views import (
-    SubscriptionPlanListView,
-    SubscriptionPlanDetailView,
-    MySubscriptionView,
-    subscription_usage,
-    upgrade_subscription,
-    cancel_subscription,
-    SubscriptionHistoryListView,
-    AdminSubscriptionListView,
-    AdminSubscriptionPlanView,
-    AdminSubscriptionPlanDetailView,
-)
-
 app_name = 'authentication'
 
 urlpatterns = [
@@ -47,16 +33,5 @@ urlpatterns = [
 	path('users/<int:pk>/', UserDetailView.as_view(), name='user-detail'),
 	
 	# Subscription endpoints
-	path('subscription/plans/', SubscriptionPlanListView.as_view(), name='subscription-plans'),
-	path('subscription/plans/<int:pk>/', SubscriptionPlanDetailView.as_view(), name='subscription-plan-detail'),
-	path('subscription/my-subscription/', MySubscriptionView.as_view(), name='my-subscription'),
-	path('subscription/usage/', subscription_usage, name='subscription-usage'),
-	path('subscription/upgrade/', upgrade_subscription, name='upgrade-subscription'),
-	path('subscription/cancel/', cancel_subscription, name='cancel-subscription'),
-	path('subscription/history/', SubscriptionHistoryListView.as_view(), name='subscription-history'),
-	
-	# Admin subscription endpoints
-	path('subscription/admin/subscriptions/', AdminSubscriptionListView.as_view(), name='admin-subscriptions'),
-	path('subscription/admin/plans/', AdminSubscriptionPlanView.as_view(), name='admin-subscription-plans'),
-	path('subscription/admin/plans/<int:pk>/', AdminSubscriptionPlanDetailView.as_view(), name='admin-subscription-plan-detail'),
+	path('subscription/', include('authentication.subscription_urls')),
 ]
@@ -1,18 +1,25 @@
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import generics, status, filters
+from rest_framework_simplejwt.exceptions import TokenError
 from rest_framework_simplejwt.tokens import RefreshToken
+from django.db import transaction
 from django.db.models import Q
+from aevum.background import run_in_background
+from aevum.mixins import JSONLinesExportMixin
 from aevum.pagination import StandardResultsPagination
+from aevum.throttles import ChangePasswordRateThrottle, ForgotPasswordRateThrottle
+from aevum.upload_handlers import MaxUploadSizeHandler
 from django.contrib.auth import authenticate
-from django.contrib.auth.models import User
-from django.core.mail import send_mail
-from django.conf import settings
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from django.contrib.auth.models import User, update_last_login
+from django.http import HttpResponse
 from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from django.utils.html import strip_tags
+from django.views.decorators.http import require_GET
 import re
+from datetime import datetime, time
 
 from .serializers import (
     UserProfileSerializer, 
@@ -24,31 +31,56 @@ from .serializers import (
     UserListSerializer,
     UserDetailSerializer
 )
-from .models import PasswordResetToken
+from .models import PasswordResetToken, UserProfile, PROFILE_IMAGE_FIELDS, PROFILE_IMAGE_MAX_SIZE
 from .schemas import (
-    get_health_schema,
-    get_register_schema,
-    get_login_schema,
-    get_logout_schema,
-    get_forgot_password_schema,
-    get_validate_reset_token_schema,
-    get_reset_password_schema,
-    get_change_password_schema,
-    get_profile_schema,
-    get_profile_image_update_schema,
-    get_profile_image_delete_schema
+    REGISTER_SCHEMA,
+    LOGIN_SCHEMA,
+    LOGOUT_SCHEMA,
+    FORGOT_PASSWORD_SCHEMA,
+    VALIDATE_RESET_TOKEN_SCHEMA,
+    RESET_PASSWORD_SCHEMA,
+    CHANGE_PASSWORD_SCHEMA,
+    PROFILE_SCHEMA,
+    PROFILE_IMAGE_UPDATE_SCHEMA,
+    PROFILE_IMAGE_DELETE_SCHEMA
 )
-from .models import SubscriptionPlan, UserSubscription, SubscriptionHistory
+from .tasks import record_subscription_history, send_password_reset_email
 
+# Returned whether or not the email belongs to an account
+FORGOT_PASSWORD_MESSAGE = 'If an account exists for this email, a password reset link has been sent'
 
-@get_health_schema()
-@api_view(['GET'])
-@permission_classes([AllowAny])
+# New passwords need upper and lower case, a digit and a special character
+PASSWORD_COMPLEXITY_RE = re.compile(r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$')
+
+
+
+class _SignOnceRefreshToken(RefreshToken):
+	"""
+	for_user() already signs the refresh token to store it as outstanding;
+	keep that string so the response doesn't sign the same payload again
+	"""
+	_encoded = None
+	
+	def __setitem__(self, key, value):
+		self._encoded = None
+		super().__setitem__(key, value)
+	
+	def __str__(self):
+		if self._encoded is None:
+			self._encoded = super().__str__()
+		return self._encoded
+
+
+# Readiness probes hit this constantly; answer with a constant body and skip DRF entirely
+HEALTH_RESPONSE_BODY = b'{"status":"ok","app":"authentication"}'
+
+
+@require_GET
 def health(request):
-	return Response({"status": "ok", "app": request.resolver_match.app_name or request.resolver_match.namespace or "unknown"})
+	return HttpResponse(HEALTH_RESPONSE_BODY, content_type='application/json')
 
 
-@get_register_schema()
+@REGISTER_SCHEMA
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def register(request):
@@ -58,43 +90,28 @@ def register(request):
     serializer = UserRegistrationSerializer(data=request.data)
     
     if serializer.is_valid():
-        # Create the user
-        user = serializer.save()
-        
-        # Get or create free plan
-        free_plan, _ = SubscriptionPlan.objects.get_or_create(
-            plan_type='FREE',
-            defaults={
-                'name': 'Free Plan',
-                'description': 'Basic features at no cost',
-                'price': 0.00,
-                'billing_cycle': 'MONTHLY',
-                'is_active': True
-            }
-        )
-        
-        # Create user subscription
-        subscription, created = UserSubscription.objects.get_or_create(
-            user=user,
-            defaults={
-                'plan': free_plan,
-                'status': 'ACTIVE',
-                'payment_method': 'FREE'
-            }
-        )
-        
-        # Create subscription history
-        SubscriptionHistory.objects.create(
-            user=user,
-            subscription=subscription,
-            action_type='CREATED',
-            new_plan=free_plan,
-            amount=0.00,
-            notes='Initial free plan on registration'
-        )
+        # User, profile, subscription and history commit together
+        with transaction.atomic():
+            # Create the user
+            user = serializer.save()
+            
+            # The post_save signal inserted the free subscription and the
+            # one-to-one assignment cached it on the user, so no query here
+            subscription = user.subscription
+            
+            # The audit row is written off the request path once registration commits
+            run_in_background(
+                record_subscription_history,
+                user_id=user.pk,
+                subscription_id=subscription.pk,
+                action_type='CREATED',
+                new_plan_id=subscription.plan_id,
+                amount=0.00,
+                notes='Initial free plan on registration'
+            )
         
         # Generate JWT tokens
-        refresh = RefreshToken.for_user(user)
+        refresh = _SignOnceRefreshToken.for_user(user)
         access_token = refresh.access_token
         
         return Response({
@@ -118,7 +135,7 @@ def register(request):
     }, status=status.HTTP_400_BAD_REQUEST)
 
 
-@get_login_schema()
+@LOGIN_SCHEMA
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def login(request):
@@ -148,12 +165,12 @@ def login(request):
 			status=status.HTTP_401_UNAUTHORIZED
 		)
 	
-	# Update last_login field
-	user.last_login = timezone.now()
-	user.save(update_fields=['last_login'])
+	# authenticate() doesn't send user_logged_in and there is no session login,
+	# so record last_login through Django's own receiver (one UPDATE)
+	update_last_login(None, user)
 	
 	# Generate JWT tokens
-	refresh = RefreshToken.for_user(user)
+	refresh = _SignOnceRefreshToken.for_user(user)
 	access_token = refresh.access_token
 	
 	return Response({
@@ -172,40 +189,39 @@ def login(request):
 	}, status=status.HTTP_200_OK)
 
 
-@get_logout_schema()
+@LOGOUT_SCHEMA
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def logout(request):
 	"""
 	Logout endpoint that blacklists the refresh token
 	"""
+	refresh_token = request.data.get('refresh_token')
+	
+	if not refresh_token:
+		return Response(
+			{"error": "Refresh token is required"}, 
+			status=status.HTTP_400_BAD_REQUEST
+		)
+	
+	# Blacklist the refresh token; malformed, expired and non-refresh tokens raise TokenError
 	try:
-		refresh_token = request.data.get('refresh_token')
-		
-		if not refresh_token:
-			return Response(
-				{"error": "Refresh token is required"}, 
-				status=status.HTTP_400_BAD_REQUEST
-			)
-		
-		# Blacklist the refresh token
-		token = RefreshToken(refresh_token)
-		token.blacklist()
-		
-		return Response({
-			"message": "Logout successful"
-		}, status=status.HTTP_200_OK)
-		
-	except Exception as e:
+		RefreshToken(refresh_token).blacklist()
+	except TokenError:
 		return Response(
 			{"error": "Invalid refresh token"}, 
 			status=status.HTTP_400_BAD_REQUEST
 		)
+	
+	return Response({
+		"message": "Logout successful"
+	}, status=status.HTTP_200_OK)
 
 
-@get_forgot_password_schema()
+@FORGOT_PASSWORD_SCHEMA
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([ForgotPasswordRateThrottle])
 def forgot_password(request):
     """
     Send password reset email to user
@@ -214,48 +230,24 @@ def forgot_password(request):
     
     if serializer.is_valid():
         email = serializer.validated_data['email']
-        user = User.objects.get(email=email)
+        # Only what the token row and the email greeting need
+        user = User.objects.only('id', 'username', 'first_name').filter(email=email).first()
+        if user is None:
+            # Same response as a real account, so the endpoint can't be used to probe emails
+            return Response({
+                'message': FORGOT_PASSWORD_MESSAGE
+            }, status=status.HTTP_200_OK)
         
-        # Create password reset token
+        # Invalidate any outstanding tokens, then create a fresh one
+        PasswordResetToken.invalidate_for_user(user)
         reset_token = PasswordResetToken.objects.create(user=user)
         
-        # Prepare email content
-        reset_url = f"{settings.SITE_URL or 'http://localhost:3000'}/reset-password?token={reset_token.token}"
-        
-        # Email context for templates
-        from datetime import datetime
-        context = {
-            'user_name': user.first_name or user.username,
-            'reset_url': reset_url,
-            'current_year': datetime.now().year,
-            'user': user,
-            'token': reset_token.token
-        }
-        
-        subject = 'Password Reset - Aevum Health'
-        
-        # Render email templates
-        html_message = render_to_string('emails/password_reset.html', context)
-        plain_message = render_to_string('emails/password_reset.txt', context)
+        # SMTP is slow; send after the response path, on the background pool
+        run_in_background(send_password_reset_email, email, user.first_name or user.username, reset_token.token)
         
-        try:
-            send_mail(
-                subject=subject,
-                message=plain_message,
-                from_email=settings.DEFAULT_FROM_EMAIL,
-                recipient_list=[email],
-                html_message=html_message,
-                fail_silently=False,
-            )
-            
-            return Response({
-                'message': 'Password reset email sent successfully'
-            }, status=status.HTTP_200_OK)
-            
-        except Exception as e:
-            return Response({
-                'error': 'Failed to send email. Please try again later.'
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        return Response({
+            'message': FORGOT_PASSWORD_MESSAGE
+        }, status=status.HTTP_200_OK)
     
     return Response({
         'error': 'Validation failed',
@@ -263,7 +255,7 @@ def forgot_password(request):
     }, status=status.HTTP_400_BAD_REQUEST)
 
 
-@get_validate_reset_token_schema()
+@VALIDATE_RESET_TOKEN_SCHEMA
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def validate_reset_token(request):
@@ -279,31 +271,24 @@ def validate_reset_token(request):
         }, status=status.HTTP_400_BAD_REQUEST)
     
     try:
-        reset_token = PasswordResetToken.objects.get(token=token)
-        
-        if reset_token.is_valid():
-            return Response({
-                'valid': True,
-                'message': 'Token is valid',
-                'user_info': {
-                    'email': reset_token.user.email,
-                    'username': reset_token.user.username
-                }
-            }, status=status.HTTP_200_OK)
-        else:
-            return Response({
-                'valid': False,
-                'error': 'Invalid or expired reset token'
-            }, status=status.HTTP_400_BAD_REQUEST)
-            
+        reset_token = PasswordResetToken.objects.valid().select_related('user').get(token=token)
     except PasswordResetToken.DoesNotExist:
         return Response({
             'valid': False,
-            'error': 'Invalid reset token'
+            'error': 'Invalid or expired reset token'
         }, status=status.HTTP_400_BAD_REQUEST)
+    
+    return Response({
+        'valid': True,
+        'message': 'Token is valid',
+        'user_info': {
+            'email': reset_token.user.email,
+            'username': reset_token.user.username
+        }
+    }, status=status.HTTP_200_OK)
 
 
-@get_reset_password_schema()
+@RESET_PASSWORD_SCHEMA
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def reset_password(request):
@@ -316,19 +301,13 @@ def reset_password(request):
         reset_token = serializer.validated_data['reset_token']
         new_password = serializer.validated_data['new_password']
         
-        # Reset the password
+        # Reset the password; the user came joined with the token
         user = reset_token.user
         user.set_password(new_password)
-        user.save()
+        user.save(update_fields=['password'])
         
-        # Mark token as used
-        reset_token.mark_as_used()
-        
-        # Invalidate all existing password reset tokens for this user
-        PasswordResetToken.objects.filter(
-            user=user, 
-            is_used=False
-        ).exclude(id=reset_token.id).update(is_used=True)
+        # Mark this token, and any other outstanding ones, as used in one UPDATE
+        PasswordResetToken.invalidate_for_user(user)
         
         return Response({
             'message': 'Password reset successful'
@@ -340,9 +319,10 @@ def reset_password(request):
     }, status=status.HTTP_400_BAD_REQUEST)
 
 
-@get_change_password_schema()
+@CHANGE_PASSWORD_SCHEMA
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([ChangePasswordRateThrottle])
 def change_password(request):
     """
     Change user's password after verifying current password
@@ -356,6 +336,12 @@ def change_password(request):
             'error': 'Current password and new password are required'
         }, status=status.HTTP_400_BAD_REQUEST)
 
+    # Validate new password complexity first; it is far cheaper than verifying the hash
+    if not PASSWORD_COMPLEXITY_RE.match(new_password):
+        return Response({
+            'error': 'Password must be at least 8 characters long and include uppercase, lowercase, number, and special character'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
     # Check if current password is correct
     user = request.user
     if not user.check_password(current_password):
@@ -363,39 +349,45 @@ def change_password(request):
             'error': 'Current password is incorrect'
         }, status=status.HTTP_400_BAD_REQUEST)
 
-    # Validate new password complexity
-    password_regex = r'^(?=.*[a-z])(?=.*[A-Z])(?=.*\d)(?=.*[@$!%*?&])[A-Za-z\d@$!%*?&]{8,}$'
-    if not re.match(password_regex, new_password):
-        return Response({
-            'error': 'Password must be at least 8 characters long and include uppercase, lowercase, number, and special character'
-        }, status=status.HTTP_400_BAD_REQUEST)
-
     # Set new password
     user.set_password(new_password)
-    user.save()
+    user.save(update_fields=['password'])
 
     return Response({
         'message': 'Password changed successfully'
     }, status=status.HTTP_200_OK)
 
 
-@get_profile_schema()
-class MyProfileView(generics.RetrieveUpdateAPIView):
+class ProfileImageUploadLimitMixin:
+	"""Abort oversized profile image uploads while the request body is still streaming"""
+
+	def initial(self, request, *args, **kwargs):
+		super().initial(request, *args, **kwargs)
+		request.upload_handlers.insert(0, MaxUploadSizeHandler(
+			request,
+			max_size=PROFILE_IMAGE_MAX_SIZE,
+			message="Image file too large. Maximum size is 5MB."
+		))
+
+
+@PROFILE_SCHEMA
+class MyProfileView(ProfileImageUploadLimitMixin, generics.RetrieveUpdateAPIView):
 	serializer_class = UserProfileSerializer
 	permission_classes = [IsAuthenticated]
 
 	def get_object(self):
-		return self.request.user.profile
+		return self.serializer_class.setup_eager_loading(UserProfile.objects).get(user=self.request.user)
 
 
-@get_profile_image_update_schema()
-class ProfileImageUpdateView(generics.UpdateAPIView):
+@PROFILE_IMAGE_UPDATE_SCHEMA
+class ProfileImageUpdateView(ProfileImageUploadLimitMixin, generics.UpdateAPIView):
 	serializer_class = ProfileImageSerializer
 	permission_classes = [IsAuthenticated]
 	http_method_names = ['put', 'patch', 'delete']
 
 	def get_object(self):
-		return self.request.user.profile
+		# Only the image and a few demographic columns are needed here
+		return UserProfile.objects.only(*PROFILE_IMAGE_FIELDS).get(user=self.request.user)
 
 	def update(self, request, *args, **kwargs):
 		partial = kwargs.pop('partial', False)
@@ -416,7 +408,7 @@ class ProfileImageUpdateView(generics.UpdateAPIView):
 			'profile_image_url': serializer.data.get('profile_image_url')
 		})
 
-	@get_profile_image_delete_schema()
+	@PROFILE_IMAGE_DELETE_SCHEMA
 	def delete(self, request, *args, **kwargs):
 		"""Delete the user's profile image"""
 		instance = self.get_object()
@@ -446,7 +438,7 @@ from drf_spectacular.utils import extend_schema
 	summary='List Users',
 	description='Get a paginated list of all users (excludes superadmin users). Requires admin privileges.'
 )
-class UserListView(generics.ListAPIView):
+class UserListView(JSONLinesExportMixin, generics.ListAPIView):
 	"""
 	List all users with pagination, filtering, and search capabilities
 	Excludes superadmin users for security
@@ -463,9 +455,9 @@ class UserListView(generics.ListAPIView):
 		"""
 		Get all users except superadmin users
 		"""
-		queryset = User.objects.filter(
+		queryset = self.serializer_class.setup_eager_loading(User.objects.filter(
 			is_superuser=False  # Exclude superadmin users
-		).select_related('profile')
+		))
 		
 		# Additional filtering options
 		is_active = self.request.query_params.get('is_active')
@@ -476,18 +468,36 @@ class UserListView(generics.ListAPIView):
 		if is_staff is not None:
 			queryset = queryset.filter(is_staff=is_staff.lower() == 'true')
 		
-		# Date range filtering
-		date_joined_after = self.request.query_params.get('date_joined_after')
+		# Date range filtering; unparseable values are ignored
+		date_joined_after = _parse_query_datetime(self.request.query_params.get('date_joined_after'))
 		if date_joined_after:
 			queryset = queryset.filter(date_joined__gte=date_joined_after)
 		
-		date_joined_before = self.request.query_params.get('date_joined_before')
+		date_joined_before = _parse_query_datetime(self.request.query_params.get('date_joined_before'))
 		if date_joined_before:
 			queryset = queryset.filter(date_joined__lte=date_joined_before)
 		
 		return queryset
 
 
+def _parse_query_datetime(value):
+	"""Parse an ISO date or datetime query param into an aware datetime, or None"""
+	if not value:
+		return None
+	try:
+		parsed = parse_datetime(value)
+		if parsed is None:
+			parsed_date = parse_date(value)
+			if parsed_date is None:
+				return None
+			parsed = datetime.combine(parsed_date, time.min)
+	except ValueError:
+		return None
+	if timezone.is_naive(parsed):
+		parsed = timezone.make_aware(parsed)
+	return parsed
+
+
 @extend_schema(
 	tags=['Authentication'],
 	summary='Get User Details',
@@ -504,6 +514,6 @@ class UserDetailView(generics.RetrieveAPIView):
 		"""
 		Get user queryset excluding superadmin users
 		"""
-		return User.objects.filter(
+		return self.serializer_class.setup_eager_loading(User.objects.filter(
 			is_superuser=False  # Exclude superadmin users
-		).select_related('profile')
+		))
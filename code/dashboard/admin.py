@@ -1,17 +1,138 @@
+import csv
+import io
+from itertools import islice
+
 from django.contrib import admin
+from django.contrib.admin.views.main import ChangeList
+from django.core.paginator import Paginator
+from django.db import connections
+from django.http import StreamingHttpResponse
+from django.utils.functional import cached_property
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils import timezone
 from django.db.models import Count
 from .models import EarlyAccessRequest, ContactMessage
 
+# Rows fetched per round trip when streaming a CSV export
+CSV_EXPORT_CHUNK_SIZE = 2000
+
+# Below this many rows an exact COUNT(*) is cheap enough to keep
+ESTIMATED_COUNT_THRESHOLD = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that takes the planner's row estimate for unfiltered changelists on
+    PostgreSQL instead of running COUNT(*). Filtered or searched lists, small
+    tables and other databases still get an exact count.
+    """
+    
+    @cached_property
+    def count(self):
+        query = self.object_list.query
+        connection = connections[self.object_list.db]
+        if connection.vendor == 'postgresql' and not query.where:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [query.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            # reltuples is -1 until the table has been analyzed
+            if row and row[0] >= ESTIMATED_COUNT_THRESHOLD:
+                return row[0]
+        return super().count
+
+
+# Badge markup depends only on the choice value, so each admin renders it once per
+# choice at import time and changelist rows just look it up
+BADGE_TEMPLATE = (
+    '<span style="background-color: {}; color: white; padding: 3px 8px; '
+    'border-radius: 3px; font-size: 11px;">{}</span>'
+)
+INTEREST_TEMPLATE = '<span style="color: {}; font-weight: bold;">{}</span>'
+DEFAULT_BADGE_COLOR = '#95a5a6'
+
+PRIORITY_COLORS = {
+    'LOW': '#95a5a6',
+    'MEDIUM': '#f39c12',
+    'HIGH': '#e67e22',
+    'URGENT': '#e74c3c'
+}
+
+
+def render_choice_badges(choices, colors, template=BADGE_TEMPLATE):
+    """Pre-rendered safe HTML for every choice, keyed by the stored value"""
+    return {
+        value: format_html(template, colors.get(value, DEFAULT_BADGE_COLOR), label)
+        for value, label in choices
+    }
+
+
+def choice_badge(badges, value, template=BADGE_TEMPLATE):
+    """Cached badge for value; values outside the choices are shown raw, like get_FOO_display()"""
+    badge = badges.get(value)
+    if badge is None:
+        badge = format_html(template, DEFAULT_BADGE_COLOR, value)
+    return badge
+
+
+class ProjectedColumnsChangeList(ChangeList):
+    """ChangeList whose row query loads only the admin's changelist_only columns"""
+    
+    def get_queryset(self, request, exclude_parameters=None):
+        return super().get_queryset(request, exclude_parameters).only(*self.model_admin.changelist_only)
+
+
+class ProjectedColumnsAdminMixin:
+    """
+    Fetch just the columns list_display (and __str__) reads. Only the changelist
+    (and the actions it runs) is affected; the change form still loads every field.
+    """
+    changelist_only = ()
+    
+    def get_changelist(self, request, **kwargs):
+        return ProjectedColumnsChangeList
+
+
+def stream_csv(filename, header, rows, chunk_size=CSV_EXPORT_CHUNK_SIZE):
+    """Stream header and rows as a CSV download, formatting chunk_size rows per writerows() call"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    def chunks():
+        writer.writerow(header)
+        rows_iter = iter(rows)
+        while True:
+            chunk = list(islice(rows_iter, chunk_size))
+            if chunk:
+                writer.writerows(chunk)
+            if buffer.tell():
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+            if len(chunk) < chunk_size:
+                return
+    
+    return StreamingHttpResponse(
+        chunks(),
+        content_type='text/csv',
+        headers={'Content-Disposition': f'attachment; filename="{filename}"'}
+    )
+
 
 @admin.register(EarlyAccessRequest)
-class EarlyAccessRequestAdmin(admin.ModelAdmin):
+class EarlyAccessRequestAdmin(ProjectedColumnsAdminMixin, admin.ModelAdmin):
     """
     Admin interface for Early Access Requests
     """
     
+    changelist_only = (
+        'full_name', 'email', 'phone_number', 'primary_interest', 'status',
+        'priority', 'created_at', 'contacted_at'
+    )
+    
     list_display = [
         'full_name',
         'email',
@@ -92,6 +213,8 @@ class EarlyAccessRequestAdmin(admin.ModelAdmin):
     
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     actions = [
         'mark_as_contacted',
@@ -100,57 +223,38 @@ class EarlyAccessRequestAdmin(admin.ModelAdmin):
         'export_to_csv'
     ]
     
+    interest_badges = render_choice_badges(EarlyAccessRequest.INTEREST_CHOICES, {
+        'DNA_ANALYSIS': '#e74c3c',
+        'MENTAL_WELLNESS': '#3498db',
+        'NUTRITION': '#2ecc71',
+        'FITNESS': '#f39c12',
+        'AI_COMPANION': '#9b59b6',
+        'COMPREHENSIVE': '#34495e',
+        'OTHER': '#95a5a6'
+    }, template=INTEREST_TEMPLATE)
+    status_badges = render_choice_badges(EarlyAccessRequest.STATUS_CHOICES, {
+        'PENDING': '#f39c12',
+        'CONTACTED': '#3498db',
+        'INTERESTED': '#2ecc71',
+        'ONBOARDED': '#27ae60',
+        'NOT_INTERESTED': '#e74c3c',
+        'INVALID': '#95a5a6'
+    })
+    priority_badges = render_choice_badges(EarlyAccessRequest.PRIORITY_CHOICES, PRIORITY_COLORS)
+    
     def primary_interest_display(self, obj):
         """Display primary interest with color coding"""
-        colors = {
-            'DNA_ANALYSIS': '#e74c3c',
-            'MENTAL_WELLNESS': '#3498db',
-            'NUTRITION': '#2ecc71',
-            'FITNESS': '#f39c12',
-            'AI_COMPANION': '#9b59b6',
-            'COMPREHENSIVE': '#34495e',
-            'OTHER': '#95a5a6'
-        }
-        color = colors.get(obj.primary_interest, '#95a5a6')
-        return format_html(
-            '<span style="color: {}; font-weight: bold;">{}</span>',
-            color,
-            obj.get_interest_display_name()
-        )
+        return choice_badge(self.interest_badges, obj.primary_interest, template=INTEREST_TEMPLATE)
     primary_interest_display.short_description = 'Interest'
     
     def status_badge(self, obj):
         """Display status with badge styling"""
-        colors = {
-            'PENDING': '#f39c12',
-            'CONTACTED': '#3498db',
-            'INTERESTED': '#2ecc71',
-            'ONBOARDED': '#27ae60',
-            'NOT_INTERESTED': '#e74c3c',
-            'INVALID': '#95a5a6'
-        }
-        color = colors.get(obj.status, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px; font-size: 11px;">{}</span>',
-            color,
-            obj.get_status_display()
-        )
+        return choice_badge(self.status_badges, obj.status)
     status_badge.short_description = 'Status'
     
     def priority_badge(self, obj):
         """Display priority with badge styling"""
-        colors = {
-            'LOW': '#95a5a6',
-            'MEDIUM': '#f39c12',
-            'HIGH': '#e67e22',
-            'URGENT': '#e74c3c'
-        }
-        color = colors.get(obj.priority, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px; font-size: 11px;">{}</span>',
-            color,
-            obj.get_priority_display()
-        )
+        return choice_badge(self.priority_badges, obj.priority)
     priority_badge.short_description = 'Priority'
     
     def days_since_request(self, obj):
@@ -210,41 +314,49 @@ class EarlyAccessRequestAdmin(admin.ModelAdmin):
     
     def export_to_csv(self, request, queryset):
         """Export selected requests to CSV"""
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="early_access_requests.csv"'
+        values = queryset.values_list(
+            'email', 'full_name', 'phone_number', 'primary_interest', 'status',
+            'priority', 'created_at', 'contacted_at', 'admin_notes'
+        )
+        # Plain dict lookups instead of get_FOO_display() for every exported row
+        interest_labels = dict(EarlyAccessRequest.INTEREST_CHOICES)
+        status_labels = dict(EarlyAccessRequest.STATUS_CHOICES)
+        priority_labels = dict(EarlyAccessRequest.PRIORITY_CHOICES)
+        rows = (
+            (
+                email,
+                full_name,
+                phone_number or '',
+                interest_labels.get(primary_interest, primary_interest),
+                status_labels.get(status, status),
+                priority_labels.get(priority, priority),
+                created_at.strftime('%Y-%m-%d %H:%M'),
+                contacted_at.strftime('%Y-%m-%d %H:%M') if contacted_at else '',
+                admin_notes or ''
+            )
+            for email, full_name, phone_number, primary_interest, status, priority, created_at, contacted_at, admin_notes
+            in values.iterator(chunk_size=CSV_EXPORT_CHUNK_SIZE)
+        )
         
-        writer = csv.writer(response)
-        writer.writerow([
+        return stream_csv('early_access_requests.csv', [
             'Email', 'Full Name', 'Phone', 'Interest', 'Status', 
             'Priority', 'Created At', 'Contacted At', 'Notes'
-        ])
-        
-        for obj in queryset:
-            writer.writerow([
-                obj.email,
-                obj.full_name,
-                obj.phone_number or '',
-                obj.get_interest_display_name(),
-                obj.get_status_display(),
-                obj.get_priority_display(),
-                obj.created_at.strftime('%Y-%m-%d %H:%M'),
-                obj.contacted_at.strftime('%Y-%m-%d %H:%M') if obj.contacted_at else '',
-                obj.admin_notes or ''
-            ])
-        
-        return response
+        ], rows)
     export_to_csv.short_description = 'Export to CSV'
 
 
 @admin.register(ContactMessage)
-class ContactMessageAdmin(admin.ModelAdmin):
+class ContactMessageAdmin(ProjectedColumnsAdminMixin, admin.ModelAdmin):
     """
     Admin interface for Contact Messages
     """
     
+    changelist_only = (
+        'full_name', 'email', 'subject', 'category', 'status', 'priority',
+        'first_read_at', 'responded_at', 'created_at',
+        'assigned_to__username', 'assigned_to__first_name', 'assigned_to__last_name'
+    )
+    
     list_display = [
         'full_name',
         'email',
@@ -344,6 +456,8 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     ordering = ['-created_at']
     date_hierarchy = 'created_at'
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
     
     actions = [
         'mark_as_read',
@@ -353,6 +467,30 @@ class ContactMessageAdmin(admin.ModelAdmin):
         'export_to_csv'
     ]
     
+    category_badges = render_choice_badges(ContactMessage.CATEGORY_CHOICES, {
+        'GENERAL': '#95a5a6',
+        'SUPPORT': '#e74c3c',
+        'BILLING': '#f39c12',
+        'FEATURE': '#3498db',
+        'BUG': '#e67e22',
+        'PARTNERSHIP': '#9b59b6',
+        'MEDIA': '#2ecc71',
+        'OTHER': '#34495e'
+    })
+    status_badges = render_choice_badges(ContactMessage.STATUS_CHOICES, {
+        'NEW': '#e74c3c',
+        'READ': '#f39c12',
+        'IN_PROGRESS': '#3498db',
+        'RESPONDED': '#2ecc71',
+        'RESOLVED': '#27ae60',
+        'CLOSED': '#95a5a6'
+    })
+    priority_badges = render_choice_badges(ContactMessage.PRIORITY_CHOICES, PRIORITY_COLORS)
+    
+    def get_queryset(self, request):
+        # assigned_to_display reads the user on every changelist row
+        return super().get_queryset(request).select_related('assigned_to')
+    
     def subject_truncated(self, obj):
         """Display truncated subject"""
         if len(obj.subject) > 50:
@@ -362,56 +500,17 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     def category_badge(self, obj):
         """Display category with badge styling"""
-        colors = {
-            'GENERAL': '#95a5a6',
-            'SUPPORT': '#e74c3c',
-            'BILLING': '#f39c12',
-            'FEATURE': '#3498db',
-            'BUG': '#e67e22',
-            'PARTNERSHIP': '#9b59b6',
-            'MEDIA': '#2ecc71',
-            'OTHER': '#34495e'
-        }
-        color = colors.get(obj.category, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px; font-size: 11px;">{}</span>',
-            color,
-            obj.get_category_display()
-        )
+        return choice_badge(self.category_badges, obj.category)
     category_badge.short_description = 'Category'
     
     def status_badge(self, obj):
         """Display status with badge styling"""
-        colors = {
-            'NEW': '#e74c3c',
-            'READ': '#f39c12',
-            'IN_PROGRESS': '#3498db',
-            'RESPONDED': '#2ecc71',
-            'RESOLVED': '#27ae60',
-            'CLOSED': '#95a5a6'
-        }
-        color = colors.get(obj.status, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px; font-size: 11px;">{}</span>',
-            color,
-            obj.get_status_display()
-        )
+        return choice_badge(self.status_badges, obj.status)
     status_badge.short_description = 'Status'
     
     def priority_badge(self, obj):
         """Display priority with badge styling"""
-        colors = {
-            'LOW': '#95a5a6',
-            'MEDIUM': '#f39c12',
-            'HIGH': '#e67e22',
-            'URGENT': '#e74c3c'
-        }
-        color = colors.get(obj.priority, '#95a5a6')
-        return format_html(
-            '<span style="background-color: {}; color: white; padding: 3px 8px; border-radius: 3px; font-size: 11px;">{}</span>',
-            color,
-            obj.get_priority_display()
-        )
+        return choice_badge(self.priority_badges, obj.priority)
     priority_badge.short_description = 'Priority'
     
     def assigned_to_display(self, obj):
@@ -456,21 +555,29 @@ class ContactMessageAdmin(admin.ModelAdmin):
     days_since_message_display.short_description = 'Time Since Message'
     
     # Admin Actions
+    # Bulk equivalents of ContactMessage.mark_as_read/mark_as_responded: one UPDATE
+    # for the whole selection. update() skips auto_now, so updated_at is set here.
     def mark_as_read(self, request, queryset):
         """Mark selected messages as read"""
-        updated = 0
-        for obj in queryset.filter(status='NEW'):
-            obj.mark_as_read(request.user)
-            updated += 1
+        now = timezone.now()
+        updated = queryset.filter(status='NEW').update(
+            status='READ',
+            first_read_at=now,
+            first_read_by=request.user,
+            updated_at=now
+        )
         self.message_user(request, f'{updated} messages marked as read.')
     mark_as_read.short_description = 'Mark as read'
     
     def mark_as_responded(self, request, queryset):
         """Mark selected messages as responded"""
-        updated = 0
-        for obj in queryset:
-            obj.mark_as_responded(request.user)
-            updated += 1
+        now = timezone.now()
+        updated = queryset.update(
+            status='RESPONDED',
+            responded_at=now,
+            responded_by=request.user,
+            updated_at=now
+        )
         self.message_user(request, f'{updated} messages marked as responded.')
     mark_as_responded.short_description = 'Mark as responded'
     
@@ -488,31 +595,34 @@ class ContactMessageAdmin(admin.ModelAdmin):
     
     def export_to_csv(self, request, queryset):
         """Export selected messages to CSV"""
-        import csv
-        from django.http import HttpResponse
-        
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = 'attachment; filename="contact_messages.csv"'
+        # values_list() also drops the changelist's assigned_to join
+        values = queryset.values_list(
+            'email', 'full_name', 'subject', 'category', 'status', 'priority',
+            'created_at', 'first_read_at', 'responded_at', 'message'
+        )
+        # Plain dict lookups instead of get_FOO_display() for every exported row
+        category_labels = dict(ContactMessage.CATEGORY_CHOICES)
+        status_labels = dict(ContactMessage.STATUS_CHOICES)
+        priority_labels = dict(ContactMessage.PRIORITY_CHOICES)
+        rows = (
+            (
+                email,
+                full_name,
+                subject,
+                category_labels.get(category, category),
+                status_labels.get(status, status),
+                priority_labels.get(priority, priority),
+                created_at.strftime('%Y-%m-%d %H:%M'),
+                first_read_at.strftime('%Y-%m-%d %H:%M') if first_read_at else '',
+                responded_at.strftime('%Y-%m-%d %H:%M') if responded_at else '',
+                message[:100] + '...' if len(message) > 100 else message
+            )
+            for email, full_name, subject, category, status, priority, created_at, first_read_at, responded_at, message
+            in values.iterator(chunk_size=CSV_EXPORT_CHUNK_SIZE)
+        )
         
-        writer = csv.writer(response)
-        writer.writerow([
+        return stream_csv('contact_messages.csv', [
             'Email', 'Full Name', 'Subject', 'Category', 'Status', 
             'Priority', 'Created At', 'First Read At', 'Responded At', 'Message'
-        ])
-        
-        for obj in queryset:
-            writer.writerow([
-                obj.email,
-                obj.full_name,
-                obj.subject,
-                obj.get_category_display(),
-                obj.get_status_display(),
-                obj.get_priority_display(),
-                obj.created_at.strftime('%Y-%m-%d %H:%M'),
-                obj.first_read_at.strftime('%Y-%m-%d %H:%M') if obj.first_read_at else '',
-                obj.responded_at.strftime('%Y-%m-%d %H:%M') if obj.responded_at else '',
-                obj.message[:100] + '...' if len(obj.message) > 100 else obj.message
-            ])
-        
-        return response
+        ], rows)
     export_to_csv.short_description = 'Export to CSV'
@@ -2,165 +2,190 @@
 Email utility functions for Dashboard notifications
 """
 
-from django.core.mail import send_mail, EmailMultiAlternatives
+from django.core.mail import send_mail, EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.urls import reverse
 from django.utils.html import strip_tags
 import logging
 
+from aevum.background import run_in_background
+
 logger = logging.getLogger(__name__)
 
 
+def _admin_change_url(obj):
+    """Absolute admin change-page URL for obj, following wherever the admin is mounted"""
+    opts = obj._meta
+    path = reverse(f'admin:{opts.app_label}_{opts.model_name}_change', args=[obj.pk])
+    return f"{settings.SITE_URL.rstrip('/')}{path}"
+
+
+def _deliver(messages):
+    """Send messages over a single SMTP connection; one failing message doesn't stop the others"""
+    with get_connection() as connection:
+        for message in messages:
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                logger.error(f"Failed to deliver email to {', '.join(message.to)}: {e}")
+
+
+def _send_messages(*builds):
+    """
+    Render each (builder, instance, description) message in the caller and queue
+    the ones that rendered for delivery together on the background pool.
+    Returns whether each message was queued.
+    """
+    messages = []
+    queued = []
+    for builder, instance, description in builds:
+        try:
+            message = builder(instance)
+        except Exception as e:
+            logger.error(f"Failed to send {description}: {e}")
+            queued.append(False)
+            continue
+        messages.append(message)
+        queued.append(True)
+        logger.info(f"{description[0].upper()}{description[1:]} queued for {', '.join(message.to)}")
+    
+    if messages:
+        # SMTP is slow; deliver on the background pool instead of in the request
+        run_in_background(_deliver, messages)
+    return queued
+
+
+def _early_access_confirmation_message(early_access_request):
+    """Rendered early access confirmation email"""
+    subject = "Thank you for your interest in Aevum Health!"
+    
+    # Email context
+    context = {
+        'user_name': early_access_request.full_name,
+        'interest': early_access_request.get_interest_display_name(),
+        'request_id': str(early_access_request.request_id),
+        'support_email': settings.CONTACT_EMAIL,
+    }
+    
+    # Render HTML email
+    html_content = render_to_string('emails/early_access_confirmation.html', context)
+    text_content = render_to_string('emails/early_access_confirmation.txt', context)
+    
+    # Create email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[early_access_request.email],
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+
 def send_early_access_confirmation_email(early_access_request):
     """
     Send confirmation email to user who submitted early access request
     """
-    try:
-        subject = "Thank you for your interest in Aevum Health!"
-        
-        # Email context
-        context = {
-            'user_name': early_access_request.full_name,
-            'interest': early_access_request.get_interest_display_name(),
-            'request_id': str(early_access_request.request_id),
-            'support_email': settings.CONTACT_EMAIL,
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/early_access_confirmation.html', context)
-        text_content = render_to_string('emails/early_access_confirmation.txt', context)
-        
-        # Create email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[early_access_request.email],
-        )
-        email.attach_alternative(html_content, "text/html")
-        
-        # Send email
-        email.send()
-        
-        logger.info(f"Early access confirmation email sent to {early_access_request.email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send early access confirmation email: {e}")
-        return False
+    return _send_messages((_early_access_confirmation_message, early_access_request, 'early access confirmation email'))[0]
+
+
+def _early_access_admin_notification_message(early_access_request):
+    """Rendered early access admin notification"""
+    subject = f"New Early Access Request - {early_access_request.full_name}"
+    
+    # Email context
+    context = {
+        'request': early_access_request,
+        'admin_url': _admin_change_url(early_access_request),
+    }
+    
+    # Render HTML email
+    html_content = render_to_string('emails/early_access_admin_notification.html', context)
+    text_content = render_to_string('emails/early_access_admin_notification.txt', context)
+    
+    # Create email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[settings.ADMIN_EMAIL],
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
 
 
 def send_early_access_admin_notification(early_access_request):
     """
     Send notification email to admin about new early access request
     """
-    try:
-        subject = f"New Early Access Request - {early_access_request.full_name}"
-        
-        # Email context
-        context = {
-            'request': early_access_request,
-            'admin_url': f"{settings.SITE_URL}admin/dashboard/earlyaccessrequest/{early_access_request.id}/change/",
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/early_access_admin_notification.html', context)
-        text_content = render_to_string('emails/early_access_admin_notification.txt', context)
-        
-        # Create email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[settings.ADMIN_EMAIL],
-        )
-        email.attach_alternative(html_content, "text/html")
-        
-        # Send email
-        email.send()
-        
-        logger.info(f"Early access admin notification sent for {early_access_request.email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send early access admin notification: {e}")
-        return False
+    return _send_messages((_early_access_admin_notification_message, early_access_request, 'early access admin notification'))[0]
+
+
+def _contact_message_confirmation_message(contact_message):
+    """Rendered contact message confirmation email"""
+    subject = "We received your message - Aevum Health"
+    
+    # Email context
+    context = {
+        'user_name': contact_message.full_name,
+        'subject': contact_message.subject,
+        'message_id': str(contact_message.message_id),
+        'support_email': settings.CONTACT_EMAIL,
+    }
+    
+    # Render HTML email
+    html_content = render_to_string('emails/contact_message_confirmation.html', context)
+    text_content = render_to_string('emails/contact_message_confirmation.txt', context)
+    
+    # Create email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[contact_message.email],
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
 
 
 def send_contact_message_confirmation_email(contact_message):
     """
     Send confirmation email to user who submitted contact message
     """
-    try:
-        subject = "We received your message - Aevum Health"
-        
-        # Email context
-        context = {
-            'user_name': contact_message.full_name,
-            'subject': contact_message.subject,
-            'message_id': str(contact_message.message_id),
-            'support_email': settings.CONTACT_EMAIL,
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/contact_message_confirmation.html', context)
-        text_content = render_to_string('emails/contact_message_confirmation.txt', context)
-        
-        # Create email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[contact_message.email],
-        )
-        email.attach_alternative(html_content, "text/html")
-        
-        # Send email
-        email.send()
-        
-        logger.info(f"Contact message confirmation email sent to {contact_message.email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send contact message confirmation email: {e}")
-        return False
+    return _send_messages((_contact_message_confirmation_message, contact_message, 'contact message confirmation email'))[0]
+
+
+def _contact_message_admin_notification_message(contact_message):
+    """Rendered contact message admin notification"""
+    subject = f"New Contact Message - {contact_message.subject}"
+    
+    # Email context
+    context = {
+        'message': contact_message,
+        'admin_url': _admin_change_url(contact_message),
+    }
+    
+    # Render HTML email
+    html_content = render_to_string('emails/contact_message_admin_notification.html', context)
+    text_content = render_to_string('emails/contact_message_admin_notification.txt', context)
+    
+    # Create email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[settings.ADMIN_EMAIL],
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
 
 
 def send_contact_message_admin_notification(contact_message):
     """
     Send notification email to admin about new contact message
     """
-    try:
-        subject = f"New Contact Message - {contact_message.subject}"
-        
-        # Email context
-        context = {
-            'message': contact_message,
-            'admin_url': f"{settings.SITE_URL}admin/dashboard/contactmessage/{contact_message.id}/change/",
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/contact_message_admin_notification.html', context)
-        text_content = render_to_string('emails/contact_message_admin_notification.txt', context)
-        
-        # Create email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[settings.ADMIN_EMAIL],
-        )
-        email.attach_alternative(html_content, "text/html")
-        
-        # Send email
-        email.send()
-        
-        logger.info(f"Contact message admin notification sent for {contact_message.email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send contact message admin notification: {e}")
-        return False
+    return _send_messages((_contact_message_admin_notification_message, contact_message, 'contact message admin notification'))[0]
 
 
 def send_dashboard_emails(instance, email_type):
@@ -172,21 +197,27 @@ def send_dashboard_emails(instance, email_type):
         email_type: 'early_access' or 'contact_message'
     
     Returns:
-        dict: Status of both email sends
+        dict: Whether each email was rendered and queued for delivery. Delivery
+        happens after the transaction commits; SMTP failures are only logged.
     """
     results = {
-        'user_email_sent': False,
-        'admin_email_sent': False,
+        'user_email_queued': False,
+        'admin_email_queued': False,
         'errors': []
     }
     
     try:
+        # Both emails share one SMTP connection
         if email_type == 'early_access':
-            results['user_email_sent'] = send_early_access_confirmation_email(instance)
-            results['admin_email_sent'] = send_early_access_admin_notification(instance)
+            results['user_email_queued'], results['admin_email_queued'] = _send_messages(
+                (_early_access_confirmation_message, instance, 'early access confirmation email'),
+                (_early_access_admin_notification_message, instance, 'early access admin notification'),
+            )
         elif email_type == 'contact_message':
-            results['user_email_sent'] = send_contact_message_confirmation_email(instance)
-            results['admin_email_sent'] = send_contact_message_admin_notification(instance)
+            results['user_email_queued'], results['admin_email_queued'] = _send_messages(
+                (_contact_message_confirmation_message, instance, 'contact message confirmation email'),
+                (_contact_message_admin_notification_message, instance, 'contact message admin notification'),
+            )
         else:
             results['errors'].append(f"Unknown email type: {email_type}")
             
@@ -197,84 +228,86 @@ def send_dashboard_emails(instance, email_type):
     return results 
 
 
+def _dna_kit_order_user_message(order):
+    """Rendered DNA kit order confirmation email"""
+    subject = f"Your Aevum DNA Kit Order Confirmation - {order.order_id}"
+    
+    # Email context
+    context = {
+        'user_name': order.user.first_name or order.user.username,
+        'order_id': str(order.order_id),
+        'kit_type': order.kit_type.name,
+        'order_date': order.order_date,
+        'total_amount': order.total_amount,
+        'status': order.status,
+        'support_email': settings.CONTACT_EMAIL,
+    }
+    
+    # Render HTML email
+    html_content = render_to_string('emails/dna_kit_order_user_confirmation.html', context)
+    text_content = render_to_string('emails/dna_kit_order_user_confirmation.txt', context)
+    
+    # Create email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[order.user.email],
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+
 def send_dna_kit_order_user_notification(order):
     """
     Send confirmation email to user about DNA kit order
     """
-    try:
-        subject = f"Your Aevum DNA Kit Order Confirmation - {order.order_id}"
-        
-        # Email context
-        context = {
-            'user_name': order.user.first_name or order.user.username,
-            'order_id': str(order.order_id),
-            'kit_type': order.kit_type.name,
-            'order_date': order.order_date,
-            'total_amount': order.total_amount,
-            'status': order.status,
-            'support_email': settings.CONTACT_EMAIL,
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/dna_kit_order_user_confirmation.html', context)
-        text_content = render_to_string('emails/dna_kit_order_user_confirmation.txt', context)
-        
-        # Create email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[order.user.email],
-        )
-        email.attach_alternative(html_content, "text/html")
-        
-        # Send email
-        email.send()
-        
-        logger.info(f"DNA kit order confirmation email sent to {order.user.email}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send DNA kit order confirmation email: {e}")
-        return False
+    return _send_messages((_dna_kit_order_user_message, order, 'DNA kit order confirmation email'))[0]
+
+
+def _dna_kit_order_admin_message(order):
+    """Rendered DNA kit order admin notification"""
+    subject = f"New DNA Kit Order - {order.order_id}"
+    
+    # Email context
+    context = {
+        'order': order,
+        'user_details': order.user,
+        'admin_url': _admin_change_url(order),
+    }
+    
+    # Render HTML email
+    html_content = render_to_string('emails/dna_kit_order_admin_notification.html', context)
+    text_content = render_to_string('emails/dna_kit_order_admin_notification.txt', context)
+    
+    # Create email
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=text_content,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[settings.ADMIN_EMAIL],
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
 
 
 def send_dna_kit_order_admin_notification(order):
     """
     Send notification email to admin about new DNA kit order
     """
-    try:
-        subject = f"New DNA Kit Order - {order.order_id}"
-        
-        # Email context
-        context = {
-            'order': order,
-            'user_details': order.user,
-            'admin_url': f"{settings.SITE_URL}admin/dna_profile/dnakitorder/{order.id}/change/",
-        }
-        
-        # Render HTML email
-        html_content = render_to_string('emails/dna_kit_order_admin_notification.html', context)
-        text_content = render_to_string('emails/dna_kit_order_admin_notification.txt', context)
-        
-        # Create email
-        email = EmailMultiAlternatives(
-            subject=subject,
-            body=text_content,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[settings.ADMIN_EMAIL],
-        )
-        email.attach_alternative(html_content, "text/html")
-        
-        # Send email
-        email.send()
-        
-        logger.info(f"DNA kit order admin notification sent for order {order.order_id}")
-        return True
-        
-    except Exception as e:
-        logger.error(f"Failed to send DNA kit order admin notification: {e}")
-        return False 
+    return _send_messages((_dna_kit_order_admin_message, order, 'DNA kit order admin notification'))[0]
+
+
+
+def send_dna_kit_order_emails(order):
+    """
+    Send the user confirmation and admin notification for a new DNA kit order
+    over one SMTP connection; returns whether each was queued
+    """
+    return _send_messages(
+        (_dna_kit_order_user_message, order, 'DNA kit order confirmation email'),
+        (_dna_kit_order_admin_message, order, 'DNA kit order admin notification'),
+    )
 
 
 def send_dna_results_ready_notification(order, dna_report):
@@ -341,10 +374,10 @@ def send_dna_results_ready_notification(order, dna_report):
         )
         email.attach_alternative(html_content, "text/html")
         
-        # Send email
-        email.send()
+        # SMTP is slow; deliver on the background pool instead of in the request
+        run_in_background(_deliver, [email])
         
-        logger.info(f"DNA results ready notification sent to {order.user.email}")
+        logger.info(f"DNA results ready notification queued for {order.user.email}")
         return True
         
     except Exception as e:
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.6 on 2026-10-16 19:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['first_read_at'], name='dashboard_c_first_r_3a3476_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['responded_at'], name='dashboard_c_respond_fd9106_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='earlyaccessrequest',
+            index=models.Index(fields=['contacted_at'], name='dashboard_e_contact_fa3680_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-16 19:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_admin_date_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='contactmessage',
+            name='dashboard_c_status_8fc331_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='earlyaccessrequest',
+            name='dashboard_e_status_6949b4_idx',
+        ),
+        migrations.AddIndex(
+            model_name='contactmessage',
+            index=models.Index(fields=['status', 'category', '-created_at'], name='dashboard_c_status_992fb7_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='earlyaccessrequest',
+            index=models.Index(fields=['status', 'priority', '-created_at'], name='dashboard_e_status_bc21ae_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='earlyaccessrequest',
+            index=models.Index(fields=['primary_interest', '-created_at'], name='dashboard_e_primary_72f5f8_idx'),
+        ),
+    ]
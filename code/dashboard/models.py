@@ -126,9 +126,13 @@ class EarlyAccessRequest(models.Model):
         verbose_name_plural = "Early Access Requests"
         indexes = [
             models.Index(fields=['email']),
-            models.Index(fields=['status']),
+            # Composite indexes follow the admin list_filter drill-downs and
+            # the default -created_at ordering; they also serve status alone
+            models.Index(fields=['status', 'priority', '-created_at']),
+            models.Index(fields=['primary_interest', '-created_at']),
             models.Index(fields=['priority']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['contacted_at']),
         ]
     
     def __str__(self):
@@ -292,10 +296,12 @@ class ContactMessage(models.Model):
         verbose_name_plural = "Contact Messages"
         indexes = [
             models.Index(fields=['email']),
-            models.Index(fields=['status']),
+            models.Index(fields=['status', 'category', '-created_at']),
             models.Index(fields=['priority']),
             models.Index(fields=['category']),
             models.Index(fields=['created_at']),
+            models.Index(fields=['first_read_at']),
+            models.Index(fields=['responded_at']),
         ]
     
     def __str__(self):
@@ -117,15 +117,15 @@ class EarlyAccessRequestCreateView(generics.CreateAPIView):
             email_results = send_dashboard_emails(early_access_request, 'early_access')
             
             # Log email results
-            if email_results['user_email_sent']:
-                logger.info(f"Confirmation email sent to user: {early_access_request.email}")
+            if email_results['user_email_queued']:
+                logger.info(f"Confirmation email queued for user: {early_access_request.email}")
             else:
-                logger.warning(f"Failed to send confirmation email to user: {early_access_request.email}")
+                logger.warning(f"Failed to queue confirmation email to user: {early_access_request.email}")
                 
-            if email_results['admin_email_sent']:
-                logger.info(f"Admin notification sent for early access request: {early_access_request.email}")
+            if email_results['admin_email_queued']:
+                logger.info(f"Admin notification queued for early access request: {early_access_request.email}")
             else:
-                logger.warning(f"Failed to send admin notification for early access request: {early_access_request.email}")
+                logger.warning(f"Failed to queue admin notification for early access request: {early_access_request.email}")
             
             if email_results['errors']:
                 logger.error(f"Email errors for early access request {early_access_request.email}: {email_results['errors']}")
@@ -134,9 +134,10 @@ class EarlyAccessRequestCreateView(generics.CreateAPIView):
                 'message': 'Thank you for your interest! We have received your early access request.',
                 'request_id': str(early_access_request.request_id),
                 'status': 'success',
-                'emails_sent': {
-                    'user_confirmation': email_results['user_email_sent'],
-                    'admin_notification': email_results['admin_email_sent']
+                # Queued for delivery after commit, not yet accepted by SMTP
+                'emails_queued': {
+                    'user_confirmation': email_results['user_email_queued'],
+                    'admin_notification': email_results['admin_email_queued']
                 }
             }, status=status.HTTP_201_CREATED)
         
@@ -283,15 +284,15 @@ class ContactMessageCreateView(generics.CreateAPIView):
             email_results = send_dashboard_emails(contact_message, 'contact_message')
             
             # Log email results
-            if email_results['user_email_sent']:
-                logger.info(f"Confirmation email sent to user: {contact_message.email}")
+            if email_results['user_email_queued']:
+                logger.info(f"Confirmation email queued for user: {contact_message.email}")
             else:
-                logger.warning(f"Failed to send confirmation email to user: {contact_message.email}")
+                logger.warning(f"Failed to queue confirmation email to user: {contact_message.email}")
                 
-            if email_results['admin_email_sent']:
-                logger.info(f"Admin notification sent for contact message: {contact_message.email}")
+            if email_results['admin_email_queued']:
+                logger.info(f"Admin notification queued for contact message: {contact_message.email}")
             else:
-                logger.warning(f"Failed to send admin notification for contact message: {contact_message.email}")
+                logger.warning(f"Failed to queue admin notification for contact message: {contact_message.email}")
             
             if email_results['errors']:
                 logger.error(f"Email errors for contact message {contact_message.email}: {email_results['errors']}")
@@ -300,9 +301,10 @@ class ContactMessageCreateView(generics.CreateAPIView):
                 'message': 'Thank you for contacting us! We will respond to your message soon.',
                 'message_id': str(contact_message.message_id),
                 'status': 'success',
-                'emails_sent': {
-                    'user_confirmation': email_results['user_email_sent'],
-                    'admin_notification': email_results['admin_email_sent']
+                # Queued for delivery after commit, not yet accepted by SMTP
+                'emails_queued': {
+                    'user_confirmation': email_results['user_email_queued'],
+                    'admin_notification': email_results['admin_email_queued']
                 }
             }, status=status.HTTP_201_CREATED)
         
@@ -29,10 +29,7 @@ from .serializers import (
     DNAPDFUploadDetailSerializer, ExtractedDNADataSerializer, ProcessExtractedDataSerializer,
     DNAConsentSerializer, DNAPDFUploadResponseSerializer
 )
-from dashboard.email_utils import (
-    send_dna_kit_order_user_notification,
-    send_dna_kit_order_admin_notification
-)
+from dashboard.email_utils import send_dna_kit_order_emails
 
 
 # Using centralized pagination classes from aevum.pagination
@@ -106,11 +103,8 @@ class DNAKitOrderCreateView(generics.CreateAPIView):
         
         # Send email notifications
         try:
-            # Send user confirmation email
-            send_dna_kit_order_user_notification(order)
-            
-            # Send admin notification email
-            send_dna_kit_order_admin_notification(order)
+            # User confirmation and admin notification share one SMTP connection
+            send_dna_kit_order_emails(order)
         except Exception as e:
             # Log email sending errors without interrupting order creation
             logger.error(f"Failed to send DNA kit order emails: {e}")
@@ -3,24 +3,39 @@ Authentication API Tests
 Tests for authentication API endpoints including login, registration, profile management, etc.
 """
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth.models import User
 from django.urls import reverse
 from django.core import mail
+from django.utils import timezone
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework.test import APITestCase, APIClient
 from rest_framework import status
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework_simplejwt.backends import TokenBackend
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
 from rest_framework_simplejwt.tokens import RefreshToken
+import io
+from unittest import mock
+import json
+from datetime import timedelta
 import tempfile
 from PIL import Image
 import os
 
-from authentication.models import UserProfile, PasswordResetToken
+from authentication.models import UserProfile, UserMedicalHistory, PasswordResetToken, SubscriptionPlan, SubscriptionHistory, UserSubscription, clear_free_plan_cache, get_free_plan_id, subscription_plan_cache_key
+from authentication.serializers import PasswordResetSerializer, SubscriptionPlanSerializer, UserListSerializer, UserSubscriptionSerializer, serialize_plans
 
 
 class AuthenticationAPITests(APITestCase):
     """Test cases for Authentication API endpoints"""
     
     def setUp(self):
+        # Throttle counters live in the cache and would otherwise carry over between tests
+        cache.clear()
         self.client = APIClient()
         self.user_data = {
             'username': 'testuser',
@@ -51,6 +66,23 @@ class AuthenticationAPITests(APITestCase):
         self.assertIn('message', response.data)
         self.assertTrue(User.objects.filter(username='newuser').exists())
     
+    def test_user_registration_with_phone_number(self):
+        """Test registration stores the phone number on the new profile"""
+        url = reverse('authentication:register')
+        data = {
+            'username': 'phoneuser',
+            'email': 'phoneuser@example.com',
+            'password': 'newpass123',
+            'password_confirm': 'newpass123',
+            'first_name': 'Phone',
+            'last_name': 'User',
+            'phone_number': '+919876543210'
+        }
+        
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(UserProfile.objects.get(user__username='phoneuser').phone_number, '+919876543210')
+    
     def test_user_registration_duplicate_username(self):
         """Test registration with duplicate username"""
         url = reverse('authentication:register')
@@ -60,6 +92,48 @@ class AuthenticationAPITests(APITestCase):
         
         response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('username', response.data['details'])
+        self.assertNotIn('email', response.data['details'])
+    
+    def test_user_registration_duplicate_email_and_username(self):
+        """Test registration reports both taken fields"""
+        url = reverse('authentication:register')
+        data = self.user_data.copy()
+        data['password_confirm'] = data['password']
+        
+        response = self.client.post(url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(set(response.data['details']), {'email', 'username'})
+    
+    def test_registration_uses_cached_free_plan(self):
+        """Test registration reads the free plan id from the process cache, not the database"""
+        with self.captureOnCommitCallbacks(execute=True):
+            free_plan_id = get_free_plan_id()
+        self.addCleanup(clear_free_plan_cache)
+        data = {
+            'username': 'newuser',
+            'email': 'newuser@example.com',
+            'password': 'newpass123',
+            'password_confirm': 'newpass123',
+            'first_name': 'New',
+            'last_name': 'User'
+        }
+        
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('authentication:register'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(any('FROM "authentication_subscriptionplan"' in q['sql'] for q in ctx.captured_queries))
+        # The history row is only written after commit, off the request path
+        self.assertFalse(SubscriptionHistory.objects.filter(user__username='newuser').exists())
+        with self.settings(BACKGROUND_TASKS_EAGER=True):
+            for callback in callbacks:
+                callback()
+        subscription_writes = [q['sql'] for q in ctx.captured_queries if '"authentication_usersubscription"' in q['sql']]
+        self.assertEqual(len(subscription_writes), 1)
+        self.assertTrue(subscription_writes[0].startswith('INSERT'))
+        history = SubscriptionHistory.objects.get(user__username='newuser')
+        self.assertEqual(history.new_plan_id, free_plan_id)
+        self.assertEqual(history.subscription.plan_id, free_plan_id)
     
     def test_user_login(self):
         """Test user login endpoint"""
@@ -77,6 +151,42 @@ class AuthenticationAPITests(APITestCase):
         self.assertIn('user', response.data)
         self.assertEqual(response.data['user']['username'], 'testuser')
     
+    def test_health_does_not_touch_the_database(self):
+        """Test the health check answers without a query, so it never holds a connection"""
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('authentication:health'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'ok', 'app': 'authentication'})
+        self.assertEqual(self.client.post(reverse('authentication:health')).status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+    
+    def test_user_login_signs_each_token_once(self):
+        """Test login reuses the refresh token string recorded as outstanding instead of re-signing it"""
+        encode = TokenBackend.encode
+        with mock.patch.object(TokenBackend, 'encode', autospec=True, side_effect=encode) as encode_mock:
+            response = self.client.post(
+                reverse('authentication:login'), {'username': 'testuser', 'password': 'testpass123'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(encode_mock.call_count, 2)
+        refresh = response.data['tokens']['refresh']
+        self.assertTrue(OutstandingToken.objects.filter(user=self.user, token=refresh).exists())
+        self.assertEqual(RefreshToken(refresh)['user_id'], str(self.user.id))
+    
+    def test_user_login_records_last_login_once(self):
+        """Test login stamps last_login with a single UPDATE of that column"""
+        self.assertIsNone(self.user.last_login)
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse('authentication:login'), {'username': 'testuser', 'password': 'testpass123'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "auth_user"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('SET "last_login" =', updates[0])
+        self.user.refresh_from_db()
+        self.assertIsNotNone(self.user.last_login)
+    
     def test_user_login_invalid_credentials(self):
         """Test login with invalid credentials"""
         url = reverse('authentication:login')
@@ -108,6 +218,17 @@ class AuthenticationAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('message', response.data)
     
+    def test_user_logout_rejects_invalid_tokens(self):
+        """Test malformed and access tokens are refused with 400 rather than blacklisted"""
+        self.client.force_authenticate(user=self.user)
+        logout_url = reverse('authentication:logout')
+        access_token = str(RefreshToken.for_user(self.user).access_token)
+        
+        for bad_token in ('not-a-jwt', access_token, 12345):
+            response = self.client.post(logout_url, {'refresh_token': bad_token}, format='json')
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+            self.assertEqual(response.data['error'], 'Invalid refresh token')
+    
     def test_get_user_profile(self):
         """Test getting user profile"""
         self.client.force_authenticate(user=self.user)
@@ -118,6 +239,16 @@ class AuthenticationAPITests(APITestCase):
         self.assertIn('id', response.data)
         self.assertIn('user', response.data)
         self.assertEqual(response.data['user']['id'], self.user.id)
+        self.assertEqual(response.data['user']['full_name'], 'Test User')
+    
+    def test_get_user_profile_is_one_query(self):
+        """Test the profile, its user and medical history load in a single query"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:my-profile')
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
     
     def test_update_user_profile(self):
         """Test updating user profile"""
@@ -139,6 +270,17 @@ class AuthenticationAPITests(APITestCase):
         self.assertEqual(self.user.profile.height_cm, 175.5)
         self.assertEqual(self.user.profile.weight_kg, 70.0)
     
+    def test_update_medical_history(self):
+        """Test medical history fields are written through to UserMedicalHistory"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:my-profile')
+        
+        response = self.client.patch(url, {'allergies': 'Peanuts'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['allergies'], 'Peanuts')
+        self.assertIsNone(response.data['surgeries'])
+        self.assertEqual(UserMedicalHistory.objects.get(profile=self.user.profile).allergies, 'Peanuts')
+    
     def test_profile_image_upload(self):
         """Test profile image upload"""
         self.client.force_authenticate(user=self.user)
@@ -160,17 +302,125 @@ class AuthenticationAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.user.profile.refresh_from_db()
         self.assertTrue(self.user.profile.profile_image)
+        self.assertEqual(response.data['profile_image_url'], f"http://testserver{self.user.profile.profile_image.url}")
+    
+    def test_profile_image_upload_checks_content_not_extension(self):
+        """Test a valid image in a format other than JPEG/PNG/GIF is rejected despite a .png name"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:profile-image-update')
+        
+        buffer = io.BytesIO()
+        Image.new('RGB', (10, 10), color='blue').save(buffer, format='BMP')
+        bmp = SimpleUploadedFile('avatar.png', buffer.getvalue(), content_type='image/png')
+        response = self.client.patch(url, {'profile_image': bmp}, format='multipart')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Invalid file format', str(response.data['profile_image']))
+    
+    def test_profile_image_upload_too_large(self):
+        """Test oversized profile images are rejected while streaming"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:profile-image-update')
+        
+        oversized = SimpleUploadedFile('big.jpg', b'\xff' * (5 * 1024 * 1024 + 1), content_type='image/jpeg')
+        response = self.client.patch(url, {'profile_image': oversized}, format='multipart')
+        
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('profile_image', response.data)
+        self.user.profile.refresh_from_db()
+        self.assertFalse(self.user.profile.profile_image)
     
     def test_password_reset_request(self):
         """Test password reset request"""
         url = reverse('authentication:forgot-password')
         data = {'email': 'test@example.com'}
         
-        response = self.client.post(url, data, format='json')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(url, data, format='json')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         
         # Check token was created
         self.assertTrue(PasswordResetToken.objects.filter(user=self.user).exists())
+        user_lookup = next(q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT') and 'FROM "auth_user"' in q['sql'])
+        self.assertNotIn('"auth_user"."password"', user_lookup)
+    
+    def test_password_reset_request_unknown_email(self):
+        """Test unknown emails get the same response as registered ones"""
+        url = reverse('authentication:forgot-password')
+        with self.settings(BACKGROUND_TASKS_EAGER=True), self.captureOnCommitCallbacks(execute=True):
+            known = self.client.post(url, {'email': 'test@example.com'}, format='json')
+            unknown = self.client.post(url, {'email': 'nobody@example.com'}, format='json')
+        
+        self.assertEqual(unknown.status_code, status.HTTP_200_OK)
+        self.assertEqual(unknown.data, known.data)
+        self.assertEqual(len(mail.outbox), 1)
+    
+    def test_password_reset_email_sent_after_response(self):
+        """Test the reset email is queued on commit and carries the new token"""
+        url = reverse('authentication:forgot-password')
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(url, {'email': 'test@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(mail.outbox), 0)
+        
+        with self.settings(BACKGROUND_TASKS_EAGER=True):
+            for callback in callbacks:
+                callback()
+        token = PasswordResetToken.objects.get(user=self.user, is_used=False).token
+        self.assertEqual(mail.outbox[0].to, ['test@example.com'])
+        self.assertIn(token, mail.outbox[0].body)
+        self.assertIn('Test', mail.outbox[0].body)
+    
+    def test_password_reset_request_is_throttled(self):
+        """Test reset requests are limited per IP"""
+        url = reverse('authentication:forgot-password')
+        for _ in range(5):
+            self.client.post(url, {'email': 'nobody@example.com'}, format='json')
+        
+        response = self.client.post(url, {'email': 'nobody@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+    
+    def test_password_reset_request_invalidates_previous_tokens(self):
+        """Test requesting a new reset token invalidates older ones"""
+        old_token = PasswordResetToken.objects.create(user=self.user)
+        url = reverse('authentication:forgot-password')
+        
+        response = self.client.post(url, {'email': 'test@example.com'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        
+        old_token.refresh_from_db()
+        self.assertTrue(old_token.is_used)
+        self.assertIsNotNone(old_token.used_at)
+        self.assertEqual(PasswordResetToken.objects.filter(user=self.user, is_used=False).count(), 1)
+    
+    def test_change_password(self):
+        """Test weak new passwords are rejected and strong ones replace the old password"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:change-password')
+        
+        response = self.client.post(url, {'current_password': 'wrong', 'new_password': 'weakpass'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('at least 8 characters', response.data['error'])
+        
+        response = self.client.post(url, {'current_password': 'testpass123', 'new_password': 'Str0ng!Pass'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('Str0ng!Pass'))
+    
+    def test_change_password_updates_only_the_password_column(self):
+        """Test the password change UPDATE leaves the other auth_user columns alone"""
+        self.client.force_authenticate(user=self.user)
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                reverse('authentication:change-password'),
+                {'current_password': 'testpass123', 'new_password': 'Str0ng!Pass'}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "auth_user"')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('SET "password" =', updates[0])
+        self.assertNotIn('"email"', updates[0])
     
     def test_password_reset_confirm(self):
         """Test password reset confirmation"""
@@ -193,4 +443,444 @@ class AuthenticationAPITests(APITestCase):
         
         # Verify token was marked as used
         reset_token.refresh_from_db()
-        self.assertTrue(reset_token.is_used) 
\ No newline at end of file
+        self.assertTrue(reset_token.is_used)
+        self.assertIsNotNone(reset_token.used_at)
+    
+    def test_password_reset_confirm_invalidates_tokens_in_one_update(self):
+        """Test the used token and its siblings are invalidated by a single UPDATE"""
+        reset_token = PasswordResetToken.objects.create(user=self.user)
+        sibling = PasswordResetToken.objects.create(user=self.user)
+        data = {'token': reset_token.token, 'new_password': 'newpassword123', 'confirm_password': 'newpassword123'}
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(reverse('authentication:reset-password'), data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "authentication_passwordresettoken"')]
+        self.assertEqual(len(updates), 1)
+        self.assertFalse(PasswordResetToken.objects.filter(pk__in=[reset_token.pk, sibling.pk], is_used=False).exists())
+    
+    def test_validate_reset_token_single_query(self):
+        """Test token validation reads the token and its user in one joined query"""
+        reset_token = PasswordResetToken.objects.create(user=self.user)
+        url = reverse('authentication:validate-reset-token')
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'token': reset_token.token})
+        self.assertTrue(response.data['valid'])
+    
+    def test_password_reset_serializer_loads_user_with_token(self):
+        """Test token validation fetches the token and its user in one query"""
+        reset_token = PasswordResetToken.objects.create(user=self.user)
+        serializer = PasswordResetSerializer(data={
+            'token': reset_token.token,
+            'new_password': 'newpassword123',
+            'confirm_password': 'newpassword123'
+        })
+        
+        with self.assertNumQueries(1):
+            self.assertTrue(serializer.is_valid())
+            self.assertEqual(serializer.validated_data['reset_token'].user.username, 'testuser')
+    
+    def test_user_list_serializer_batches_plain_querysets(self):
+        """Test many=True serialization without eager loading still uses a fixed number of queries"""
+        for i in range(3):
+            User.objects.create_user(username=f'batch{i}', email=f'batch{i}@example.com', password='testpass123')
+        
+        # users, profiles (one IN query), completion counts (one IN query)
+        with self.assertNumQueries(3):
+            data = UserListSerializer(User.objects.filter(username__startswith='batch'), many=True).data
+        self.assertEqual(len(data), 3)
+        self.assertEqual(data[0]['profile_completion'], round(1 / 15 * 100, 1))
+    
+    def test_user_list_as_admin(self):
+        """Test admin user listing includes profile-derived fields"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        self.user.profile.city = 'Pune'
+        self.user.profile.save()
+        self.client.force_authenticate(user=admin)
+        url = reverse('authentication:user-list')
+        
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = {u['username']: u for u in response.data['results']}
+        self.assertIn('testuser', results)
+        self.assertIsNone(results['testuser']['profile_image_url'])
+        self.assertEqual(results['testuser']['is_active_status'], 'Active')
+        self.assertGreater(results['testuser']['profile_completion'], 0)
+    
+    def test_user_list_profile_completion_counts_filled_fields(self):
+        """Test profile completion treats blank, zero and missing profile values as unfilled"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        profile = self.user.profile
+        profile.city = 'Pune'
+        profile.phone_number = ''
+        profile.height_cm = 0
+        profile.save()
+        no_profile = User.objects.create_user(username='noprofile', email='np@example.com', password='testpass123', first_name='No')
+        UserProfile.objects.filter(user=no_profile).delete()
+        self.client.force_authenticate(user=admin)
+        
+        response = self.client.get(reverse('authentication:user-list'))
+        results = {u['username']: u for u in response.data['results']}
+        self.assertEqual(results['testuser']['profile_completion'], round(4 / 15 * 100, 1))
+        self.assertEqual(results['noprofile']['profile_completion'], round(2 / 15 * 100, 1))
+
+    def test_user_list_date_joined_filters(self):
+        """Test date_joined bounds accept dates and datetimes and ignore malformed values"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        User.objects.filter(pk=self.user.pk).update(date_joined=timezone.now() - timedelta(days=10))
+        self.client.force_authenticate(user=admin)
+        url = reverse('authentication:user-list')
+        cutoff = (timezone.now() - timedelta(days=5)).date().isoformat()
+        
+        def usernames(params):
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            return {row['username'] for row in response.data['results']}
+        
+        self.assertEqual(usernames({'date_joined_after': cutoff}), {'staff'})
+        self.assertEqual(usernames({'date_joined_before': f'{cutoff}T00:00:00Z'}), {'testuser'})
+        self.assertEqual(usernames({'date_joined_after': '2024-13-45'}), {'staff', 'testuser'})
+    
+    def test_user_list_export_streams_json_lines(self):
+        """Test ?export=1 streams every listed user in one query, matching the paginated rows"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        for i in range(3):
+            User.objects.create_user(username=f'extra{i}', email=f'extra{i}@example.com', password='testpass123')
+        self.client.force_authenticate(user=admin)
+        url = reverse('authentication:user-list')
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'export': '1', 'is_staff': 'false'})
+            rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(len(rows), 4)
+        page = self.client.get(url, {'is_staff': 'false'}).data['results']
+        self.assertEqual(rows, json.loads(json.dumps(page, cls=JSONEncoder)))
+    
+    def test_user_list_query_count_is_constant(self):
+        """Test user listing joins profiles instead of querying one per user"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        url = reverse('authentication:user-list')
+        
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(url)
+        for i in range(5):
+            User.objects.create_user(username=f'extra{i}', email=f'extra{i}@example.com', password='testpass123')
+        with CaptureQueriesContext(connection) as more_users:
+            response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(more_users), len(baseline))
+
+    def test_user_detail_skips_unrendered_columns(self):
+        """Test user detail leaves password and medical timestamps out of its single query"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        UserMedicalHistory.objects.create(profile=self.user.profile, allergies='Peanuts')
+        self.client.force_authenticate(user=admin)
+        
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse('authentication:user-detail', args=[self.user.pk]))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['profile']['allergies'], 'Peanuts')
+        detail_sql = [q['sql'] for q in ctx.captured_queries if 'FROM "auth_user"' in q['sql']]
+        self.assertEqual(len(detail_sql), 1)
+        self.assertNotIn('"auth_user"."password"', detail_sql[0])
+        self.assertNotIn('"authentication_usermedicalhistory"."created_at"', detail_sql[0])
+
+    def test_subscription_history_query_count_is_constant(self):
+        """Test subscription history joins old and new plans instead of querying per row"""
+        subscription = self.user.subscription
+        plan = SubscriptionPlan.objects.create(name='Basic', plan_type='BASIC', price=199)
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:subscription-history')
+        
+        SubscriptionHistory.objects.create(user=self.user, subscription=subscription, action_type='UPGRADED', old_plan=subscription.plan, new_plan=plan)
+        with CaptureQueriesContext(connection) as baseline:
+            self.client.get(url)
+        for _ in range(4):
+            SubscriptionHistory.objects.create(user=self.user, subscription=subscription, action_type='UPGRADED', old_plan=subscription.plan, new_plan=plan)
+        with CaptureQueriesContext(connection) as more_rows:
+            response = self.client.get(url)
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['new_plan_name'], 'Basic')
+        self.assertEqual(len(more_rows), len(baseline))
+
+    def test_my_subscription_loads_plan_in_one_query(self):
+        """Test the current subscription and its plan are fetched together"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:my-subscription')
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['plan']['plan_type'], 'FREE')
+    
+    def test_subscription_queryset_loads_only_rendered_columns(self):
+        """Test unrendered subscription and plan columns are deferred without extra queries"""
+        subscription = UserSubscriptionSerializer.setup_eager_loading(
+            UserSubscription.objects.filter(user=self.user)
+        ).get()
+        self.assertIn('cancellation_reason', subscription.get_deferred_fields())
+        self.assertIn('created_at', subscription.plan.get_deferred_fields())
+        
+        with self.assertNumQueries(0):
+            data = UserSubscriptionSerializer(subscription).data
+        self.assertEqual(data['plan']['plan_type'], 'FREE')
+    
+    def test_subscription_usage_in_one_query(self):
+        """Test usage stats and feature availability come from a single subscription+plan query"""
+        self.client.force_authenticate(user=self.user)
+        
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('authentication:subscription-usage'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['mood_entries_remaining'], 30)
+        self.assertTrue(response.data['features_available']['mood_entries'])
+        self.assertFalse(response.data['features_available']['api_access'])
+    
+    def test_admin_subscription_is_active_filter_partitions_subscriptions(self):
+        """Test is_active=true and is_active=false return complementary subscription sets"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        expired = User.objects.create_user(username='expired', email='expired@example.com', password='testpass123')
+        UserSubscription.objects.filter(user=self.user).update(end_date=timezone.now() + timedelta(days=30))
+        UserSubscription.objects.filter(user=expired).update(end_date=timezone.now() - timedelta(minutes=1))
+        self.client.force_authenticate(user=admin)
+        url = reverse('authentication:admin-subscriptions')
+        
+        active = {row['id'] for row in self.client.get(url, {'is_active': 'true'}).data['results']}
+        inactive = {row['id'] for row in self.client.get(url, {'is_active': 'false'}).data['results']}
+        self.assertEqual(active, {self.user.subscription.id})
+        self.assertEqual(inactive, {admin.subscription.id, expired.subscription.id})
+    
+    def test_upgrade_subscription_single_write(self):
+        """Test an upgrade updates the subscription once and records history after commit"""
+        plan = SubscriptionPlan.objects.create(name='Premium', plan_type='PREMIUM', price=499)
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:upgrade-subscription')
+        
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {'plan_id': plan.pk, 'payment_method': 'PAYPAL'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        updates = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('UPDATE "authentication_usersubscription"')]
+        self.assertEqual(len(updates), 1)
+        plan_reads = [q['sql'] for q in ctx.captured_queries if q['sql'].startswith('SELECT') and 'FROM "authentication_subscriptionplan"' in q['sql']]
+        self.assertEqual(len(plan_reads), 1)
+        self.assertNotIn('"sort_order"', plan_reads[0])
+        self.assertEqual(response.data['subscription']['plan']['name'], 'Premium')
+        
+        subscription = UserSubscription.objects.get(user=self.user)
+        self.assertEqual(subscription.plan, plan)
+        self.assertEqual(subscription.payment_method, 'PAYPAL')
+        self.assertEqual(subscription.last_payment_amount, plan.price)
+        history = SubscriptionHistory.objects.get(user=self.user, action_type='UPGRADED')
+        self.assertEqual(history.new_plan, plan)
+        self.assertEqual(history.old_plan.plan_type, 'FREE')
+    
+    def test_upgrade_subscription_rejects_inactive_plan(self):
+        """Test upgrading to an inactive plan is a plan_id validation error"""
+        plan = SubscriptionPlan.objects.create(name='Retired', plan_type='PREMIUM', price=499, is_active=False)
+        self.client.force_authenticate(user=self.user)
+        
+        response = self.client.post(reverse('authentication:upgrade-subscription'), {'plan_id': plan.pk}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('plan_id', response.data)
+    
+    def test_cancel_subscription_records_history_after_commit(self):
+        """Test cancellation never loads the plan and records history once committed"""
+        self.client.force_authenticate(user=self.user)
+        
+        with CaptureQueriesContext(connection) as ctx, self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(reverse('authentication:cancel-subscription'), {'reason': 'Too pricey'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertFalse(any('FROM "authentication_subscriptionplan"' in q['sql'] for q in ctx.captured_queries))
+        self.assertFalse(SubscriptionHistory.objects.filter(user=self.user).exists())
+        
+        for callback in callbacks:
+            callback()
+        subscription = UserSubscription.objects.get(user=self.user)
+        self.assertEqual(subscription.status, 'CANCELLED')
+        self.assertEqual(subscription.cancellation_reason, 'Too pricey')
+        self.assertTrue(SubscriptionHistory.objects.filter(user=self.user, action_type='CANCELLED').exists())
+    
+    def test_admin_subscription_list_uses_cursor_pages(self):
+        """Test the v2 admin list pages by cursor, newest first, without repeating rows"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        for i in range(3):
+            User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com', password='testpass123')
+        self.client.force_authenticate(user=admin)
+        
+        response = self.client.get(reverse('authentication:admin-subscriptions-v2'), {'page_size': 3})
+        first = [row['id'] for row in response.data['results']]
+        self.assertTrue(response.data['pagination']['has_next'])
+        self.assertIn('cursor=', response.data['pagination']['next'])
+        
+        second = [row['id'] for row in self.client.get(response.data['pagination']['next']).data['results']]
+        ids = list(UserSubscription.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(first + second, ids)
+    
+    def test_admin_subscription_cursor_pages_stable_ordering(self):
+        """Test cursor pages ignore nullable/non-unique orderings and break created_at ties by id"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        for i in range(4):
+            User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com', password='testpass123')
+        UserSubscription.objects.update(created_at=timezone.now(), end_date=None)
+        self.client.force_authenticate(user=admin)
+        ids = list(UserSubscription.objects.order_by('-id').values_list('id', flat=True))
+        
+        for ordering in ('end_date', 'status', '-created_at'):
+            seen = []
+            url = reverse('authentication:admin-subscriptions-v2') + f'?page_size=2&ordering={ordering}'
+            while url:
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                seen += [row['id'] for row in response.data['results']]
+                url = response.data['pagination']['next']
+            self.assertEqual(seen, ids)
+    
+    def test_admin_subscription_list_keeps_page_numbers(self):
+        """Test the original admin list still reports count and total_pages"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        self.client.force_authenticate(user=admin)
+        
+        response = self.client.get(reverse('authentication:admin-subscriptions'), {'page_size': 1, 'ordering': 'end_date'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['pagination']['count'], 2)
+        self.assertEqual(response.data['pagination']['total_pages'], 2)
+        self.assertEqual(response.data['pagination']['current_page'], 1)
+    
+    def test_admin_subscription_export_streams_json_lines(self):
+        """Test ?export=1 streams every matching subscription as one JSON object per line"""
+        admin = User.objects.create_user(username='staff', email='staff@example.com', password='staffpass123', is_staff=True)
+        for i in range(3):
+            User.objects.create_user(username=f'member{i}', email=f'member{i}@example.com', password='testpass123')
+        self.client.force_authenticate(user=admin)
+        
+        response = self.client.get(reverse('authentication:admin-subscriptions'), {'export': '1', 'page_size': 2})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(len(rows), UserSubscription.objects.count())
+        self.assertEqual(rows[0]['plan']['plan_type'], 'FREE')
+    
+    @override_settings(CACHE_USER_SUBSCRIPTIONS=True)
+    def test_my_subscription_and_usage_cached_until_subscription_changes(self):
+        """Test subscription and usage payloads come from cache until the subscription or plan changes"""
+        self.client.force_authenticate(user=self.user)
+        subscription_url = reverse('authentication:my-subscription')
+        usage_url = reverse('authentication:subscription-usage')
+        
+        self.client.get(subscription_url)
+        self.client.get(usage_url)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(subscription_url).data['status'], 'ACTIVE')
+            self.assertEqual(self.client.get(usage_url).data['mood_entries_this_month'], 0)
+        
+        subscription = self.user.subscription
+        subscription.mood_entries_this_month = 4
+        subscription.cancel_subscription()
+        self.assertEqual(self.client.get(subscription_url).data['status'], 'CANCELLED')
+        self.assertEqual(self.client.get(usage_url).data['mood_entries_this_month'], 4)
+        
+        plan = subscription.plan
+        plan.name = 'Starter'
+        plan.save()
+        self.assertEqual(self.client.get(subscription_url).data['plan']['name'], 'Starter')
+    
+    @override_settings(CACHE_USER_SUBSCRIPTIONS=True)
+    def test_my_subscription_time_dependent_fields_not_cached(self):
+        """Test is_active and days_remaining are computed per request from a cached payload"""
+        subscription = self.user.subscription
+        subscription.end_date = timezone.now() + timedelta(days=10, hours=1)
+        subscription.save()
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:my-subscription')
+        
+        response = self.client.get(url)
+        self.assertEqual(response.data['days_remaining'], 10)
+        self.assertTrue(response.data['is_active'])
+        self.assertEqual(list(response.data), UserSubscriptionSerializer.Meta.fields)
+        
+        later = timezone.now() + timedelta(days=11)
+        with self.assertNumQueries(0), mock.patch('django.utils.timezone.now', return_value=later):
+            response = self.client.get(url)
+        self.assertEqual(response.data['days_remaining'], 0)
+        self.assertFalse(response.data['is_active'])
+    
+    def test_my_subscription_and_usage_not_cached_on_local_memory(self):
+        """Test per-user payloads are read fresh when the cache is per-process"""
+        self.client.force_authenticate(user=self.user)
+        subscription_url = reverse('authentication:my-subscription')
+        usage_url = reverse('authentication:subscription-usage')
+        self.client.get(subscription_url)
+        self.client.get(usage_url)
+        
+        # A write another worker handled: no signal reaches this process's cache
+        UserSubscription.objects.filter(user=self.user).update(status='CANCELLED', mood_entries_this_month=3)
+        self.assertEqual(self.client.get(subscription_url).data['status'], 'CANCELLED')
+        self.assertEqual(self.client.get(usage_url).data['mood_entries_this_month'], 3)
+    
+    def test_subscription_usage_conditional_get(self):
+        """Test usage responses carry an ETag and a matching If-None-Match gets a 304"""
+        self.client.force_authenticate(user=self.user)
+        url = reverse('authentication:subscription-usage')
+        
+        etag = self.client.get(url)['ETag']
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        
+        subscription = self.user.subscription
+        subscription.mood_entries_this_month = 2
+        subscription.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_my_subscription_created_when_missing(self):
+        """Test users without a subscription get the free plan on first access"""
+        self.user.subscription.delete()
+        self.client.force_authenticate(user=self.user)
+        
+        response = self.client.get(reverse('authentication:my-subscription'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['status'], 'ACTIVE')
+        self.assertEqual(response.data['plan']['plan_type'], 'FREE')
+    
+    def test_subscription_plan_detail_cache_follows_saves(self):
+        """Test cached plan payloads are replaced once the plan is saved"""
+        plan = SubscriptionPlan.objects.create(name='Basic', plan_type='BASIC', price=199)
+        url = reverse('authentication:subscription-plan-detail', args=[plan.pk])
+        
+        self.assertEqual(self.client.get(url).data['name'], 'Basic')
+        self.assertIsNotNone(cache.get(subscription_plan_cache_key(plan)))
+        
+        plan.name = 'Basic Plus'
+        plan.save()
+        self.assertEqual(self.client.get(url).data['name'], 'Basic Plus')
+    
+    def test_serialize_plans_matches_serializer(self):
+        """Test the plan list fast path renders exactly what SubscriptionPlanSerializer does"""
+        SubscriptionPlan.objects.create(name='Quarterly', plan_type='BASIC', price='30.00', billing_cycle='QUARTERLY', description=None)
+        SubscriptionPlan.objects.create(name='Pro', plan_type='PREMIUM', price=99, dna_kits_included=2, ai_insights_enabled=True)
+        plans = list(SubscriptionPlan.objects.all())
+        
+        self.assertEqual(serialize_plans(plans), SubscriptionPlanSerializer(plans, many=True).data)
+    
+    def test_subscription_plan_list_cached_until_plan_changes(self):
+        """Test the plan list is served from cache and refreshed after a plan save"""
+        plan = SubscriptionPlan.objects.create(name='Basic', plan_type='BASIC', price=199)
+        url = reverse('authentication:subscription-plans')
+        
+        self.client.get(url)
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertIn('Basic', [p['name'] for p in response.data['results']])
+        
+        plan.name = 'Basic Plus'
+        plan.save()
+        names = [p['name'] for p in self.client.get(url).data['results']]
+        self.assertIn('Basic Plus', names)
+        self.assertNotIn('Basic', names)
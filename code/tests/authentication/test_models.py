@@ -4,11 +4,13 @@ Tests for UserProfile, PasswordResetToken, SubscriptionPlan, and UserSubscriptio
 """
 
 from django.test import TestCase
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.models import User
 from django.utils import timezone
 from datetime import timedelta
+from decimal import Decimal
 
-from authentication.models import UserProfile, PasswordResetToken, SubscriptionPlan, UserSubscription
+from authentication.models import UserProfile, PasswordResetToken, SubscriptionPlan, UserSubscription, user_profile_image_path
 
 
 class AuthenticationModelTests(TestCase):
@@ -43,6 +45,21 @@ class AuthenticationModelTests(TestCase):
         self.assertEqual(profile.phone_number, '+1234567890')
         self.assertEqual(str(profile.date_of_birth), '1990-01-01')
     
+    def test_user_profile_image_path(self):
+        """Test profile image upload path uses the user id and lowercased extension"""
+        path = user_profile_image_path(self.user.profile, 'My.Photo.JPG')
+        self.assertEqual(path, f"profile_images/user_{self.user.id}_profile.jpg")
+    
+    def test_password_hashed_with_argon2_and_legacy_hashes_upgraded(self):
+        """Test new passwords use Argon2 and PBKDF2 hashes are upgraded on login"""
+        self.assertTrue(self.user.password.startswith('argon2$argon2id$'))
+        
+        self.user.password = make_password('testpass123', hasher='pbkdf2_sha256')
+        self.user.save()
+        self.assertTrue(self.user.check_password('testpass123'))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.password.startswith('argon2$argon2id$'))
+    
     def test_password_reset_token_creation(self):
         """Test PasswordResetToken creation and validation"""
         token = PasswordResetToken.objects.create(user=self.user)
@@ -51,6 +68,16 @@ class AuthenticationModelTests(TestCase):
         self.assertFalse(token.is_used)
         self.assertTrue(token.is_valid())
     
+    def test_password_reset_token_bulk_create(self):
+        """Test bulk token creation issues one unique token per user"""
+        other = User.objects.create_user(username='otheruser', email='other@example.com', password='testpass123')
+        tokens = PasswordResetToken.objects.bulk_create_tokens([self.user, other])
+        
+        self.assertEqual(len(tokens), 2)
+        self.assertNotEqual(tokens[0].token, tokens[1].token)
+        self.assertEqual(len(tokens[0].token), len(PasswordResetToken.objects.create(user=self.user).token))
+        self.assertEqual(PasswordResetToken.objects.filter(user=other).count(), 1)
+    
     def test_password_reset_token_expiry(self):
         """Test PasswordResetToken expiry"""
         token = PasswordResetToken.objects.create(user=self.user)
@@ -58,7 +85,19 @@ class AuthenticationModelTests(TestCase):
         token.created_at = timezone.now() - timedelta(hours=25)
         token.save()
         self.assertFalse(token.is_valid())
-    
+
+    def test_password_reset_token_valid_queryset(self):
+        """Test valid() excludes used and expired tokens"""
+        active = PasswordResetToken.objects.create(user=self.user)
+        used = PasswordResetToken.objects.create(user=self.user, is_used=True)
+        expired = PasswordResetToken.objects.create(user=self.user)
+        PasswordResetToken.objects.filter(pk=expired.pk).update(created_at=timezone.now() - timedelta(hours=2))
+
+        self.assertEqual(PasswordResetToken.objects.valid().get(token=active.token), active)
+        for token in (used, expired):
+            with self.assertRaises(PasswordResetToken.DoesNotExist):
+                PasswordResetToken.objects.valid().get(token=token.token)
+
     def test_subscription_plan_model(self):
         """Test SubscriptionPlan model"""
         plan = SubscriptionPlan.objects.create(
@@ -69,4 +108,104 @@ class AuthenticationModelTests(TestCase):
             billing_cycle="MONTHLY"
         )
         self.assertIn("Premium", str(plan))
-        self.assertTrue(plan.is_active) 
\ No newline at end of file
+        self.assertTrue(plan.is_active)
+    
+    def test_subscription_plan_monthly_price(self):
+        """Test monthly_price is computed by the database and refreshed after updates"""
+        plan = SubscriptionPlan.objects.create(
+            name="Quarterly",
+            plan_type="BASIC",
+            price="30.00",
+            billing_cycle="QUARTERLY"
+        )
+        self.assertEqual(plan.monthly_price, Decimal('10.00'))
+        
+        plan.billing_cycle = "YEARLY"
+        plan.save()
+        self.assertEqual(plan.monthly_price, Decimal('2.50'))
+        
+        plan.billing_cycle = "LIFETIME"
+        plan.save()
+        self.assertEqual(SubscriptionPlan.objects.get(pk=plan.pk).monthly_price, Decimal('0.00'))
+    
+    def test_subscription_plan_features(self):
+        """Test features lists limits and flags and is rebuilt after save"""
+        plan = SubscriptionPlan.objects.create(
+            name="Pro",
+            plan_type="PREMIUM",
+            price="99.00",
+            dna_kits_included=2,
+            ai_insights_enabled=True
+        )
+        self.assertEqual(plan.features, ["2 DNA kits included", "Unlimited mood entries", "AI-powered insights"])
+        
+        plan.api_access_enabled = True
+        plan.save()
+        self.assertEqual(plan.features[-1], "API access")
+    
+    def test_user_subscription_with_usage(self):
+        """Test with_usage() annotations match the Python usage_percentage calculation"""
+        plan = SubscriptionPlan.objects.create(
+            name="Limited",
+            plan_type="BASIC",
+            price="10.00",
+            dna_kits_included=4,
+            mood_entries_limit=0
+        )
+        subscription = self.user.subscription
+        subscription.plan = plan
+        subscription.dna_kits_used = 1
+        subscription.save()
+        
+        annotated = UserSubscription.objects.with_usage().get(pk=subscription.pk)
+        self.assertEqual(annotated.usage_percentage, {'dna_kits': 25.0})
+        self.assertEqual(subscription.usage_percentage, annotated.usage_percentage)
+        self.assertEqual(annotated.dna_kits_remaining, 3)
+        self.assertEqual(annotated.mood_entries_remaining, -1)
+        
+        subscription.dna_kits_used = 9
+        subscription.save()
+        annotated = UserSubscription.objects.with_usage().get(pk=subscription.pk)
+        self.assertEqual(annotated.usage_percentage, {'dna_kits': 100.0})
+        self.assertEqual(annotated.dna_kits_remaining, 0)
+    
+    def test_feature_availability_map(self):
+        """Test the feature map matches can_use_feature and is all False once cancelled"""
+        plan = SubscriptionPlan.objects.create(
+            name="Kits", plan_type="BASIC", price="10.00", dna_kits_included=1, ai_insights_enabled=True
+        )
+        subscription = self.user.subscription
+        subscription.upgrade_plan(plan)
+        subscription.dna_kits_used = 1
+        
+        features = subscription.feature_availability_map()
+        self.assertFalse(features['dna_kits'])
+        self.assertTrue(features['ai_insights'])
+        self.assertEqual({name: subscription.can_use_feature(name) for name in features}, features)
+        
+        subscription.cancel_subscription()
+        self.assertFalse(any(subscription.feature_availability_map().values()))
+    
+    def test_reset_monthly_usage_bulk(self):
+        """Test bulk reset only touches subscriptions past their usage period"""
+        plan = SubscriptionPlan.objects.create(name="Monthly", plan_type="BASIC", price="10.00")
+        other = User.objects.create_user(username='otheruser', email='other@example.com', password='testpass123')
+        UserSubscription.objects.filter(user=self.user).update(
+            plan=plan, mood_entries_this_month=12,
+            last_usage_reset=timezone.now() - timedelta(days=31)
+        )
+        UserSubscription.objects.filter(user=other).update(plan=plan, mood_entries_this_month=5)
+        stale = self.user.subscription
+        fresh = other.subscription
+        
+        self.assertEqual(UserSubscription.objects.reset_monthly_usage_bulk(), 1)
+        stale.refresh_from_db()
+        fresh.refresh_from_db()
+        self.assertEqual(stale.mood_entries_this_month, 0)
+        self.assertEqual(fresh.mood_entries_this_month, 5)
+    
+    def test_user_subscription_created_on_signup(self):
+        """Test new users get an active FREE subscription automatically"""
+        subscription = UserSubscription.objects.get(user=self.user)
+        self.assertEqual(subscription.status, 'ACTIVE')
+        self.assertEqual(subscription.plan.plan_type, 'FREE')
@@ -0,0 +1,281 @@
+"""
+Dashboard Admin Tests
+Tests for the EarlyAccessRequest and ContactMessage changelists and their actions
+"""
+
+import csv
+import io
+from unittest import mock
+
+from django.contrib.admin import helpers
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dashboard.admin import ESTIMATED_COUNT_THRESHOLD, EstimatedCountPaginator, stream_csv
+from dashboard.models import EarlyAccessRequest, ContactMessage
+
+
+class DashboardChangelistTests(TestCase):
+    """Changelist rows load only the projected columns, in a constant number of queries"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123',
+            first_name='Ada',
+            last_name='Admin'
+        )
+        self.client.force_login(self.admin)
+
+    def create_early_access_request(self, index):
+        return EarlyAccessRequest.objects.create(
+            email=f'early{index}@example.com',
+            full_name=f'Early {index}',
+            primary_interest='DNA_ANALYSIS',
+            user_agent='Mozilla/5.0',
+            admin_notes='Called back'
+        )
+
+    def create_contact_message(self, index):
+        return ContactMessage.objects.create(
+            full_name=f'Contact {index}',
+            email=f'contact{index}@example.com',
+            subject='Question about my results',
+            message='A long message body the changelist never shows.',
+            user_agent='Mozilla/5.0',
+            assigned_to=self.admin
+        )
+
+    def assert_changelist_projected(self, url, create_row, skipped_column):
+        create_row(0)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(self.client.get(url).status_code, 200)
+
+        for index in range(1, 5):
+            create_row(index)
+        # Attribute reads outside the projection would add a query per row
+        with self.assertNumQueries(len(ctx.captured_queries)):
+            response = self.client.get(url)
+        self.assertContains(response, 'class="action-checkbox"', count=5)
+        self.assertFalse(any(skipped_column in query['sql'] for query in ctx.captured_queries))
+
+    def test_early_access_changelist(self):
+        """Test the early access changelist skips user_agent and admin_notes"""
+        self.assert_changelist_projected(
+            reverse('admin:dashboard_earlyaccessrequest_changelist'),
+            self.create_early_access_request,
+            '"user_agent"'
+        )
+
+    def test_contact_message_changelist(self):
+        """Test the contact changelist skips the message body and renders the assignee from the join"""
+        self.assert_changelist_projected(
+            reverse('admin:dashboard_contactmessage_changelist'),
+            self.create_contact_message,
+            '"message"'
+        )
+        self.assertContains(
+            self.client.get(reverse('admin:dashboard_contactmessage_changelist')),
+            'Ada Admin',
+            count=5
+        )
+
+
+class DashboardAdminActionTests(TestCase):
+    """Admin actions run against the rows selected on the changelist"""
+
+    def setUp(self):
+        self.admin = User.objects.create_superuser(
+            username='admin',
+            email='admin@example.com',
+            password='testpass123'
+        )
+        self.client.force_login(self.admin)
+
+    def run_action(self, model_name, action, objects):
+        return self.client.post(reverse(f'admin:dashboard_{model_name}_changelist'), {
+            'action': action,
+            helpers.ACTION_CHECKBOX_NAME: [obj.pk for obj in objects],
+        })
+
+    def read_csv(self, response):
+        return list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_early_access_export_streams_selected_rows(self):
+        """Test the early access export streams a CSV of every selected row, quoting awkward values"""
+        selected = [
+            EarlyAccessRequest.objects.create(
+                email='quoted@example.com',
+                full_name='Smith, "Jo"',
+                primary_interest='DNA_ANALYSIS',
+                priority='HIGH',
+                admin_notes='Line one\nLine two'
+            ),
+            EarlyAccessRequest.objects.create(email='plain@example.com', full_name='Plain Person'),
+        ]
+        EarlyAccessRequest.objects.create(email='skipped@example.com', full_name='Not Selected')
+
+        response = self.run_action('earlyaccessrequest', 'export_to_csv', selected)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="early_access_requests.csv"')
+
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0], [
+            'Email', 'Full Name', 'Phone', 'Interest', 'Status',
+            'Priority', 'Created At', 'Contacted At', 'Notes'
+        ])
+        self.assertEqual(len(rows), 3)
+        by_email = {row[0]: row for row in rows[1:]}
+        quoted = selected[0]
+        self.assertEqual(by_email['quoted@example.com'][1:6], [
+            'Smith, "Jo"', '', quoted.get_primary_interest_display(),
+            quoted.get_status_display(), quoted.get_priority_display()
+        ])
+        self.assertEqual(by_email['quoted@example.com'][7:], ['', 'Line one\nLine two'])
+        self.assertEqual(by_email['plain@example.com'][1], 'Plain Person')
+
+    def test_contact_message_export_streams_selected_rows(self):
+        """Test the contact export streams every selected message and truncates long bodies"""
+        long_message = 'x' * 150
+        selected = [
+            ContactMessage.objects.create(
+                full_name=f'Sender {index}',
+                email=f'sender{index}@example.com',
+                subject='Billing, "urgent"',
+                message=long_message if index else 'Short',
+                category='BILLING'
+            )
+            for index in range(3)
+        ]
+
+        response = self.run_action('contactmessage', 'export_to_csv', selected)
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="contact_messages.csv"')
+
+        rows = self.read_csv(response)
+        self.assertEqual(rows[0][0], 'Email')
+        self.assertEqual(sorted(row[0] for row in rows[1:]), [obj.email for obj in selected])
+        by_email = {row[0]: row for row in rows[1:]}
+        first = selected[0]
+        self.assertEqual(by_email['sender0@example.com'][2:6], [
+            'Billing, "urgent"', first.get_category_display(),
+            first.get_status_display(), first.get_priority_display()
+        ])
+        self.assertEqual(by_email['sender0@example.com'][9], 'Short')
+        self.assertEqual(by_email['sender1@example.com'][9], 'x' * 100 + '...')
+
+    def run_update_action(self, action, objects):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.run_action('contactmessage', action, objects)
+        self.assertEqual(response.status_code, 302)
+        updates = [query['sql'] for query in ctx.captured_queries if query['sql'].startswith('UPDATE "dashboard_contactmessage"')]
+        self.assertEqual(len(updates), 1)
+
+    def test_mark_as_read_single_update(self):
+        """Test mark as read stamps only new messages, in one UPDATE that also bumps updated_at"""
+        new, already_read = [
+            ContactMessage.objects.create(full_name='Sender', email=f'sender{index}@example.com', subject='Hi', message='Hello')
+            for index in range(2)
+        ]
+        ContactMessage.objects.filter(pk=already_read.pk).update(status='IN_PROGRESS')
+        before = ContactMessage.objects.get(pk=new.pk).updated_at
+
+        self.run_update_action('mark_as_read', [new, already_read])
+        new.refresh_from_db()
+        already_read.refresh_from_db()
+        self.assertEqual(new.status, 'READ')
+        self.assertEqual(new.first_read_by, self.admin)
+        self.assertIsNotNone(new.first_read_at)
+        self.assertEqual(new.updated_at, new.first_read_at)
+        self.assertGreater(new.updated_at, before)
+        self.assertEqual(already_read.status, 'IN_PROGRESS')
+        self.assertIsNone(already_read.first_read_at)
+
+    def test_mark_as_responded_single_update(self):
+        """Test mark as responded stamps every selected message in one UPDATE that also bumps updated_at"""
+        messages = [
+            ContactMessage.objects.create(full_name='Sender', email=f'sender{index}@example.com', subject='Hi', message='Hello')
+            for index in range(3)
+        ]
+        before = messages[0].updated_at
+
+        self.run_update_action('mark_as_responded', messages[:2])
+        for message in messages:
+            message.refresh_from_db()
+        for message in messages[:2]:
+            self.assertEqual(message.status, 'RESPONDED')
+            self.assertEqual(message.responded_by, self.admin)
+            self.assertEqual(message.updated_at, message.responded_at)
+            self.assertGreater(message.updated_at, before)
+        self.assertEqual(messages[2].status, 'NEW')
+        self.assertIsNone(messages[2].responded_at)
+
+
+class EstimatedCountPaginatorTests(TestCase):
+    """Unfiltered PostgreSQL changelists use the planner estimate; everything else counts exactly"""
+
+    def setUp(self):
+        for index in range(3):
+            EarlyAccessRequest.objects.create(email=f'early{index}@example.com', full_name=f'Early {index}')
+
+    def postgresql_connections(self, estimate):
+        """Stand-in for django.db.connections whose default alias reports PostgreSQL with reltuples = estimate"""
+        fake = mock.MagicMock(vendor='postgresql')
+        fake.cursor.return_value.__enter__.return_value.fetchone.return_value = (estimate,)
+        return fake, mock.patch('dashboard.admin.connections', {'default': fake})
+
+    def test_exact_count_on_other_databases(self):
+        """Test SQLite gets a COUNT(*) and never queries pg_class"""
+        paginator = EstimatedCountPaginator(EarlyAccessRequest.objects.all(), 2)
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(paginator.count, 3)
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertIn('COUNT(*)', ctx.captured_queries[0]['sql'])
+        self.assertNotIn('pg_class', ctx.captured_queries[0]['sql'])
+
+    def test_estimate_for_unfiltered_postgresql_queryset(self):
+        """Test an unfiltered queryset on PostgreSQL takes reltuples and skips COUNT(*)"""
+        fake, patch = self.postgresql_connections(ESTIMATED_COUNT_THRESHOLD * 5)
+        with patch, self.assertNumQueries(0):
+            paginator = EstimatedCountPaginator(EarlyAccessRequest.objects.order_by('-created_at'), 2)
+            self.assertEqual(paginator.count, ESTIMATED_COUNT_THRESHOLD * 5)
+        sql, params = fake.cursor.return_value.__enter__.return_value.execute.call_args.args
+        self.assertIn('pg_class', sql)
+        self.assertEqual(params, [EarlyAccessRequest._meta.db_table])
+
+    def test_exact_count_for_filtered_postgresql_queryset(self):
+        """Test filtered querysets count exactly, since the table estimate would be wrong"""
+        fake, patch = self.postgresql_connections(ESTIMATED_COUNT_THRESHOLD * 5)
+        with patch:
+            paginator = EstimatedCountPaginator(EarlyAccessRequest.objects.filter(email='early1@example.com'), 2)
+            self.assertEqual(paginator.count, 1)
+        fake.cursor.assert_not_called()
+
+    def test_exact_count_for_small_or_unanalyzed_postgresql_table(self):
+        """Test estimates below the threshold, including reltuples = -1, fall back to COUNT(*)"""
+        for estimate in (ESTIMATED_COUNT_THRESHOLD - 1, -1):
+            _, patch = self.postgresql_connections(estimate)
+            with patch:
+                self.assertEqual(EstimatedCountPaginator(EarlyAccessRequest.objects.all(), 2).count, 3)
+
+
+class StreamCSVTests(TestCase):
+    """stream_csv formats chunk_size rows per writerows() call and yields one string per chunk"""
+
+    def test_rows_written_in_chunks(self):
+        """Test every row is streamed, chunk by chunk, whether or not the last chunk is full"""
+        header = ['Name', 'Notes']
+        for row_count in (0, 4, 5):
+            rows = [(f'Row {index}', 'a, "quoted"\nvalue') for index in range(row_count)]
+            response = stream_csv('rows.csv', header, iter(rows), chunk_size=2)
+            self.assertEqual(response['Content-Disposition'], 'attachment; filename="rows.csv"')
+
+            chunks = list(response.streaming_content)
+            # Header plus the first chunk come together; no empty chunk after a full last one
+            self.assertEqual(len(chunks), max(1, -(-row_count // 2)))
+            parsed = list(csv.reader(io.StringIO(b''.join(chunks).decode())))
+            self.assertEqual(parsed, [header] + [list(row) for row in rows])
@@ -0,0 +1,62 @@
+"""
+Dashboard Email Tests
+Tests for delivering paired notification emails
+"""
+
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase, override_settings
+
+from dashboard.email_utils import send_dashboard_emails
+from dashboard.models import EarlyAccessRequest
+
+
+class RecordingBackend(EmailBackend):
+    """locmem backend that counts connection opens and rejects one recipient"""
+    opened = 0
+    reject = None
+
+    def open(self):
+        RecordingBackend.opened += 1
+        return True
+
+    def send_messages(self, messages):
+        for message in messages:
+            if self.reject in message.to:
+                raise ConnectionResetError(f'Rejected {self.reject}')
+        return super().send_messages(messages)
+
+
+@override_settings(
+    EMAIL_BACKEND='tests.dashboard.test_email_utils.RecordingBackend',
+    ADMIN_EMAIL='admin@example.com',
+    SITE_URL='https://aevum.example.com',
+    BACKGROUND_TASKS_EAGER=True,
+)
+class PairedEmailDeliveryTests(TestCase):
+    """The user and admin emails for one submission share an SMTP connection"""
+
+    def setUp(self):
+        RecordingBackend.opened = 0
+        RecordingBackend.reject = None
+        self.early_access = EarlyAccessRequest.objects.create(email='early@example.com', full_name='Early Bird')
+
+    def test_both_emails_sent_over_one_connection(self):
+        """Test one connection open delivers both the confirmation and the admin notification"""
+        with self.captureOnCommitCallbacks(execute=True):
+            send_dashboard_emails(self.early_access, 'early_access')
+
+        self.assertEqual(RecordingBackend.opened, 1)
+        self.assertEqual([message.to for message in mail.outbox], [['early@example.com'], ['admin@example.com']])
+
+    def test_failing_message_does_not_drop_the_other(self):
+        """Test a rejected confirmation is logged and the admin notification is still delivered"""
+        RecordingBackend.reject = 'early@example.com'
+        with self.assertLogs('dashboard.email_utils', level='ERROR') as logs, \
+                self.captureOnCommitCallbacks(execute=True):
+            results = send_dashboard_emails(self.early_access, 'early_access')
+
+        self.assertTrue(results['user_email_queued'])
+        self.assertEqual(RecordingBackend.opened, 1)
+        self.assertEqual([message.to for message in mail.outbox], [['admin@example.com']])
+        self.assertIn('early@example.com', logs.output[0])
@@ -0,0 +1,71 @@
+"""
+Dashboard API Tests
+Tests for the public early access and contact endpoints
+"""
+
+from smtplib import SMTPException
+from unittest import mock
+
+from django.core import mail
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from dashboard.models import EarlyAccessRequest, ContactMessage
+
+
+@override_settings(ADMIN_EMAIL='admin@example.com', SITE_URL='https://aevum.example.com')
+class DashboardEmailDeliveryTests(APITestCase):
+    """Notification emails are rendered in the request and delivered after commit"""
+
+    early_access_data = {
+        'email': 'early@example.com',
+        'full_name': 'Early Bird',
+        'primary_interest': 'DNA_ANALYSIS',
+    }
+    contact_data = {
+        'full_name': 'Contact Person',
+        'email': 'contact@example.com',
+        'subject': 'Question',
+        'message': 'When does the platform launch?',
+    }
+
+    def test_emails_delivered_only_after_commit(self):
+        """Test both emails are queued by the response and only reach SMTP once the transaction commits"""
+        for url, data in (
+            (reverse('dashboard:early-access-create'), self.early_access_data),
+            (reverse('dashboard:contact-create'), self.contact_data),
+        ):
+            mail.outbox = []
+            with self.captureOnCommitCallbacks() as callbacks:
+                response = self.client.post(url, data, format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['emails_queued'], {'user_confirmation': True, 'admin_notification': True})
+            self.assertEqual(len(mail.outbox), 0)
+
+            with self.settings(BACKGROUND_TASKS_EAGER=True):
+                for callback in callbacks:
+                    callback()
+            self.assertEqual(sorted(message.to[0] for message in mail.outbox), sorted([data['email'], 'admin@example.com']))
+
+    def test_send_failure_does_not_break_response(self):
+        """Test an SMTP error on delivery is logged and the submission still succeeds"""
+        failing_send = mock.patch(
+            'django.core.mail.backends.locmem.EmailBackend.send_messages',
+            side_effect=SMTPException('Connection refused')
+        )
+        with failing_send, self.settings(BACKGROUND_TASKS_EAGER=True), \
+                self.assertLogs('dashboard.email_utils', level='ERROR') as logs, \
+                self.captureOnCommitCallbacks(execute=True):
+            early_access = self.client.post(reverse('dashboard:early-access-create'), self.early_access_data, format='json')
+            contact = self.client.post(reverse('dashboard:contact-create'), self.contact_data, format='json')
+
+        for response in (early_access, contact):
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            self.assertEqual(response.data['status'], 'success')
+        self.assertTrue(EarlyAccessRequest.objects.filter(email='early@example.com').exists())
+        self.assertTrue(ContactMessage.objects.filter(email='contact@example.com').exists())
+        # Each of the four messages fails on its own
+        self.assertEqual(len(logs.records), 4)
+        self.assertEqual(len(mail.outbox), 0)